@@ -8,29 +8,51 @@ from __future__ import annotations
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ACCESS_TOKEN, Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryError, ConfigEntryNotReady
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .api import NotionApiClient
-from .const import DOMAIN, CONF_DATABASE_ID
+from .api import NotionApiClient, NotionApiClientError, NotionApiClientSchemaError
+from .const import DOMAIN, CONF_DATABASE_ID, CONF_PROPERTY_MAP, CONF_SQLITE_MIRROR
 from .coordinator import NotionDataUpdateCoordinator
+from .mirror import TaskMirror
 from .services import async_setup_services
 
 PLATFORMS: list[Platform] = [
     Platform.TODO,
+    Platform.CALENDAR,
+    Platform.SENSOR,
 ]
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up this integration using UI."""
+    client = NotionApiClient(
+        token=entry.data[CONF_ACCESS_TOKEN],
+        database_id=entry.data[CONF_DATABASE_ID],
+        session=async_get_clientsession(hass),
+        property_map=entry.data.get(CONF_PROPERTY_MAP),
+    )
+    if CONF_PROPERTY_MAP not in entry.data:
+        # Entry created before the schema was resolved in the config flow
+        try:
+            client.property_map = await client.async_get_property_map()
+        except NotionApiClientSchemaError as exception:
+            raise ConfigEntryError(exception) from exception
+        except NotionApiClientError as exception:
+            raise ConfigEntryNotReady(exception) from exception
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_PROPERTY_MAP: client.property_map}
+        )
+
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator = NotionDataUpdateCoordinator(
         hass=hass,
-        client=NotionApiClient(
-            token=entry.data[CONF_ACCESS_TOKEN],
-            database_id=entry.data[CONF_DATABASE_ID],
-            session=async_get_clientsession(hass)
-        ),
+        client=client,
     )
+    if entry.options.get(CONF_SQLITE_MIRROR):
+        coordinator.mirror = TaskMirror(hass, entry.entry_id)
+        await coordinator.mirror.async_setup()
+    await coordinator.outbox.async_load()
     await coordinator.async_config_entry_first_refresh()
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -45,7 +67,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Handle removal of an entry."""
     if unloaded := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator.due_timer.async_stop()
+        coordinator.outbox.async_stop()
+        if coordinator.mirror is not None:
+            await coordinator.mirror.async_close()
     return unloaded
 
 
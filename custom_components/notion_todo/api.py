@@ -4,12 +4,43 @@ from __future__ import annotations
 import asyncio
 import socket
 import copy
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
 import aiohttp
 import async_timeout
 from datetime import datetime
 
-from .const import NOTION_URL, NOTION_VERSION, TASK_STATUS_PROPERTY, TASK_DATE_PROPERTY
+from . import codec
+from .const import (
+    NOTION_URL,
+    NOTION_VERSION,
+    STATUS_ARCHIVED,
+    STATUS_DONE,
+    TASK_DATE_PROPERTY,
+    TASK_STATUS_PROPERTY,
+)
 from .notion_property_helper import NotionPropertyHelper as propHelper
+from .schema import (
+    ROLE_DUE,
+    ROLE_OMNIFOCUS_PROJECT,
+    ROLE_PROJECT,
+    ROLE_QUICK,
+    ROLE_STATUS,
+    ROLE_TITLE,
+    missing_roles,
+    resolve_property_map,
+)
+from .scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_POLL,
+    PRIORITY_SERVICE,
+    RequestScheduler,
+)
+
+# Responses larger than this (in bytes) are decoded in an executor thread
+EXECUTOR_DECODE_THRESHOLD = 64 * 1024
 
 
 class NotionApiClientError(Exception):
@@ -28,9 +59,33 @@ class NotionApiClientAuthenticationError(
     """Exception to indicate an authentication error."""
 
 
+class NotionApiClientSchemaError(
+    NotionApiClientError
+):
+    """Exception to indicate that the database lacks required properties."""
+
+
+@dataclass(frozen=True)
+class _PageParser:
+    """Parse one page of query results and return it with the cursor of the next.
+
+    Compared by the wrapped parser, so identical queries still share one request.
+    """
+
+    parser: Callable[[dict], list] | None
+
+    def __call__(self, data: dict) -> tuple[list, str | None]:
+        """Return the parsed results and the next cursor, None on the last page."""
+        results = self.parser(data) if self.parser else data['results']
+        return results, data['next_cursor'] if data.get('has_more') else None
+
+
 class NotionApiClient:
     """Notion API Client."""
 
+    # Root of the REST API, can be pointed at a local stand-in for load tests
+    base_url = NOTION_URL
+
     _headers = {
         'Authorization': 'Bearer <TOKEN>',
         'Content-Type': 'application/json',
@@ -41,7 +96,8 @@ class NotionApiClient:
         self,
         token: str,
         database_id: str,
-        session: aiohttp.ClientSession
+        session: aiohttp.ClientSession,
+        property_map: dict[str, dict] | None = None
     ) -> None:
         """Notion API Client.
 
@@ -49,6 +105,7 @@ class NotionApiClient:
             token (str): Notion token with access to ToDo database
             database_id (str): id of the ToDo database
             session (aiohttp.ClientSession): the session
+            property_map (dict | None): properties resolved by async_get_property_map
 
         """
         self._token = token
@@ -56,23 +113,148 @@ class NotionApiClient:
         self._headers['Authorization'] = f'Bearer {token}'
         self._database_id = database_id
         self._task_template = None
+        self.property_map = property_map
+        self.executor_decode_threshold = EXECUTOR_DECODE_THRESHOLD
+        # Owned by the client, so it never outlives the event loop it runs on
+        self._scheduler = RequestScheduler()
+        # Identical reads in flight, see _api_wrapper
+        self._in_flight: dict[tuple, asyncio.Task] = {}
 
-    async def async_get_data(self) -> any:
-        """Get data from the API."""
+    async def async_get_data(
+        self,
+        parser: Callable[[dict], list] | None = None,
+        priority: int = PRIORITY_POLL
+    ) -> any:
+        """Get data from the API.
+
+        Follows next_cursor until all matching tasks are fetched, a query
+        returns at most 100 results per request.
+
+        Args:
+            parser (Callable | None): transforms the decoded response of each
+                request into a list, runs together with the JSON decoding off
+                the event loop for large responses. The lists are concatenated.
+                Without parser the raw pages are returned as one response.
+            priority (int): scheduling class of the request
+
+        """
         today = datetime.now().strftime("%Y-%m-%d")
-        return await self._api_wrapper(
+        data = {
+            "filter": {
+                "property": self._property_id(ROLE_DUE, "Due"),
+                "date": {
+                    "on_or_after": today
+                }
+            },
+            "page_size": 100,
+        }
+        page_parser = _PageParser(parser)
+        results = []
+        while True:
+            page, next_cursor = await self._api_wrapper(
+                method="post",
+                url=f"{self.base_url}/databases/{self._database_id}/query",
+                headers=self._headers,
+                data=data,
+                parser=page_parser,
+                priority=priority,
+            )
+            results.extend(page)
+            if next_cursor is None:
+                return results if parser else {"results": results}
+            data = {**data, "start_cursor": next_cursor}
+
+    async def async_get_overdue_count(self, priority: int = PRIORITY_POLL) -> int:
+        """Count the open tasks due before today.
+
+        async_get_data only covers tasks due today or later, so overdue
+        tasks are counted by a query of their own.
+        """
+        today = datetime.now().strftime("%Y-%m-%d")
+        status = self._property_id(ROLE_STATUS, "Status")
+        data = {
+            "filter": {
+                "and": [
+                    {
+                        "property": self._property_id(ROLE_DUE, "Due"),
+                        "date": {
+                            "before": today
+                        }
+                    },
+                    *(
+                        {"property": status, "status": {"does_not_equal": closed}}
+                        for closed in (STATUS_DONE, STATUS_ARCHIVED)
+                    ),
+                ]
+            },
+            "page_size": 100,
+        }
+        count = 0
+        while True:
+            response = await self._api_wrapper(
+                method="post",
+                # Only the count is needed, skip all properties but the title
+                url=f"{self.base_url}/databases/{self._database_id}/query?filter_properties=title",
+                headers=self._headers,
+                data=data,
+                priority=priority,
+            )
+            count += len(response['results'])
+            if not response.get('has_more'):
+                return count
+            data = {**data, "start_cursor": response['next_cursor']}
+
+    async def async_get_property_map(self, priority: int = PRIORITY_SERVICE) -> dict[str, dict]:
+        """Fetch the database schema once and map the properties used by the integration.
+
+        Raises NotionApiClientSchemaError if a required property is missing.
+        """
+        property_map = resolve_property_map(await self._get_database(priority))
+        if missing := missing_roles(property_map):
+            raise NotionApiClientSchemaError(
+                f"Database is missing required properties: {', '.join(missing)}"
+            )
+        return property_map
+
+    def _property_name(self, role: str, default: str) -> str | None:
+        """Return the name of the property of a role, None if the database has none."""
+        if self.property_map is None:
+            return default
+        prop = self.property_map.get(role)
+        return prop['name'] if prop else None
+
+    def _property_id(self, role: str, default: str) -> str:
+        """Return the id of the property of a required role for query filters.
+
+        Falls back to the default property name until the schema is resolved.
+        """
+        if self.property_map is None:
+            return default
+        return self.property_map[role]['id']
+
+    async def async_get_last_edited_time(self, priority: int = PRIORITY_POLL) -> str | None:
+        """Get the last_edited_time of the most recently edited page.
+
+        A cheap probe (one result, no filter) to detect changes in the database.
+        """
+        response = await self._api_wrapper(
             method="post",
-            url=f"{NOTION_URL}/databases/{self._database_id}/query",
+            url=f"{self.base_url}/databases/{self._database_id}/query",
             headers=self._headers,
             data={
-                "filter": {
-                    "property": "Due",
-                    "date": {
-                        "on_or_after": today
+                "page_size": 1,
+                "sorts": [
+                    {
+                        "timestamp": "last_edited_time",
+                        "direction": "descending"
                     }
-                }
-            }
+                ]
+            },
+            priority=priority,
         )
+        if not response['results']:
+            return None
+        return response['results'][0]['last_edited_time']
 
     async def update_task(
         self,
@@ -80,7 +262,8 @@ class NotionApiClient:
         title: str,
         status: str,
         due: datetime,
-        description: str
+        description: str,
+        priority: int = PRIORITY_INTERACTIVE
     ) -> any:
         """Update task in Notion.
 
@@ -90,18 +273,20 @@ class NotionApiClient:
             status (str): Status of the task
             due (datetime): Due date of the task
             description (str): Description of the task
+            priority (int): scheduling class of the request
 
         """
-        task_data = await self._get_task_template()
+        task_data = await self._get_task_template(priority)
         task_data = propHelper.set_property_by_id("title", title, task_data)
         task_data = propHelper.set_property_by_id(TASK_STATUS_PROPERTY, status, task_data)
         task_data = propHelper.set_property_by_id(TASK_DATE_PROPERTY, due, task_data)
         update_properties = task_data['properties']
         return await self._api_wrapper(
             method="patch",
-            url=f"{NOTION_URL}/pages/{task_id}",
+            url=f"{self.base_url}/pages/{task_id}",
             headers=self._headers,
-            data={"properties": update_properties}
+            data={"properties": update_properties},
+            priority=priority,
         )
 
     async def create_task(
@@ -110,7 +295,8 @@ class NotionApiClient:
         status: str,
         omnifocus_project: str = "Household",
         due: str | None = None,
-        under_10_min: bool = False
+        under_10_min: bool = False,
+        priority: int = PRIORITY_SERVICE
     ) -> any:
         """Create a new task in Notion.
 
@@ -120,6 +306,7 @@ class NotionApiClient:
             omnifocus_project (str): Project for OmniFocus (default: Household)
             due (str | None): Due date in ISO format (YYYY-MM-DD) (optional)
             under_10_min (bool): Set the <10min checkbox (optional)
+            priority (int): scheduling class of the request
         """
         from .const import TASK_OMNIFOCUS_PROJECT_SYNC_PROPERTY
         
@@ -127,7 +314,7 @@ class NotionApiClient:
         properties = {}
         
         # Add title (required)
-        properties["Task name"] = {
+        properties[self._property_name(ROLE_TITLE, "Task name")] = {
             "title": [
                 {
                     "type": "text",
@@ -139,29 +326,31 @@ class NotionApiClient:
         }
         
         # Add status
-        properties["Status"] = {
+        properties[self._property_name(ROLE_STATUS, "Status")] = {
             "status": {
                 "name": status
             }
         }
         
         # Add OmniFocus project
-        properties["OmniFocus project sync"] = {
-            "select": {
-                "name": omnifocus_project
+        if name := self._property_name(ROLE_OMNIFOCUS_PROJECT, "OmniFocus project sync"):
+            properties[name] = {
+                "select": {
+                    "name": omnifocus_project
+                }
             }
-        }
 
         # Link to Household project
-        properties["Project"] = {
-            "relation": [
-                {"id": "c8fc4c85-fed8-4069-9063-593b1d4b7515"}
-            ]
-        }
+        if name := self._property_name(ROLE_PROJECT, "Project"):
+            properties[name] = {
+                "relation": [
+                    {"id": "c8fc4c85-fed8-4069-9063-593b1d4b7515"}
+                ]
+            }
         
         # Add due date if provided
         if due is not None:
-            properties["Due"] = {
+            properties[self._property_name(ROLE_DUE, "Due")] = {
                 "date": {
                     "start": due
                 }
@@ -171,8 +360,8 @@ class NotionApiClient:
             "checkbox": True
         }
 
-        if under_10_min:
-            properties["<10min"] = {
+        if under_10_min and (name := self._property_name(ROLE_QUICK, "<10min")):
+            properties[name] = {
                 "checkbox": True
             }
 
@@ -190,35 +379,87 @@ class NotionApiClient:
         
         return await self._api_wrapper(
             method="post",
-            url=f"{NOTION_URL}/pages",
+            url=f"{self.base_url}/pages",
             headers=self._headers,
-            data=task_data
+            data=task_data,
+            priority=priority,
         )
 
-    async def delete_task(self, task_id: str):
+    async def delete_task(self, task_id: str, priority: int = PRIORITY_INTERACTIVE):
         """Delete a task in Notion.
 
         Args:
             task_id (str): id of the task
+            priority (int): scheduling class of the request
 
         """
         return await self._api_wrapper(
             method="delete",
-            url=f"{NOTION_URL}/blocks/{task_id}",
-            headers=self._headers)
+            url=f"{self.base_url}/blocks/{task_id}",
+            headers=self._headers,
+            priority=priority)
+
+    async def async_get_page(self, page_id: str, priority: int = PRIORITY_SERVICE) -> any:
+        """Get a single page from the API.
+
+        Args:
+            page_id (str): id of the page
+            priority (int): scheduling class of the request
+
+        """
+        return await self._api_wrapper(
+            method="get",
+            url=f"{self.base_url}/pages/{page_id}",
+            headers=self._headers,
+            priority=priority,
+        )
+
+    async def async_get_block_children(
+        self,
+        block_id: str,
+        start_cursor: str | None = None,
+        priority: int = PRIORITY_SERVICE
+    ) -> any:
+        """Get one page of the child blocks of a block (or page).
+
+        Args:
+            block_id (str): id of the block or page
+            start_cursor (str | None): cursor returned by the previous call
+            priority (int): scheduling class of the request
+
+        """
+        url = f"{self.base_url}/blocks/{block_id}/children?page_size=100"
+        if start_cursor:
+            url += f"&start_cursor={start_cursor}"
+        return await self._api_wrapper(
+            method="get",
+            url=url,
+            headers=self._headers,
+            priority=priority,
+        )
 
-    async def _get_database(self):
+    async def _get_database(self, priority: int = PRIORITY_SERVICE):
         return await self._api_wrapper(
             method="get",
-            url=f"{NOTION_URL}/databases/{self._database_id}",
-            headers=self._headers
+            url=f"{self.base_url}/databases/{self._database_id}",
+            headers=self._headers,
+            priority=priority,
         )
 
-    async def _get_task_template(self):
+    async def _get_task_template(self, priority: int = PRIORITY_SERVICE):
         if not self._task_template:
-            database = await self._get_database()
-            properties = database['properties']
-            propHelper.del_properties_except(["title", TASK_STATUS_PROPERTY, TASK_DATE_PROPERTY], properties)
+            if self.property_map is not None:
+                # Built from the mapping resolved at setup, no schema request needed
+                properties = {
+                    prop['name']: {'id': prop['id'], 'name': prop['name'], 'type': prop['type'], prop['type']: {}}
+                    for role, prop in self.property_map.items()
+                    if role in (ROLE_TITLE, ROLE_STATUS, ROLE_DUE)
+                }
+            else:
+                database = await self._get_database(priority)
+                # The response may be shared with concurrent callers
+                properties = copy.deepcopy(database['properties'])
+                propHelper.del_properties_except(["title", TASK_STATUS_PROPERTY, TASK_DATE_PROPERTY], properties)
             self._task_template = {
                 'parent': {'database_id': self._database_id},
                 'properties': properties
@@ -231,22 +472,74 @@ class NotionApiClient:
         url: str,
         data: dict | None = None,
         headers: dict | None = None,
+        parser: Callable[[dict], any] | None = None,
+        priority: int = PRIORITY_BACKGROUND,
     ) -> any:
-        """Get information from the API."""
+        """Get information from the API.
+
+        Concurrent identical reads (GETs and database queries with the same
+        body and parser) share one request and its result, so callers must
+        not modify the returned data.
+        """
+        payload = codec.dumps(data) if data is not None else None
+        if method != "get" and not url.split("?")[0].endswith("/query"):
+            try:
+                return await self._request(method, url, payload, headers, parser, priority)
+            finally:
+                # Reads in flight may predate this write, later reads need a request of their own
+                self._in_flight.clear()
+
+        key = (method, url, payload, parser)
+        request = self._in_flight.get(key)
+        if request is None:
+            # A task of its own, so a cancelled caller does not cancel the others
+            request = asyncio.get_running_loop().create_task(
+                self._request(method, url, payload, headers, parser, priority)
+            )
+            self._in_flight[key] = request
+            request.add_done_callback(partial(self._request_done, key))
+        return await asyncio.shield(request)
+
+    def _request_done(self, key: tuple, request: asyncio.Task) -> None:
+        if self._in_flight.get(key) is request:
+            del self._in_flight[key]
+        # Retrieve the exception in case every caller was cancelled
+        if not request.cancelled():
+            request.exception()
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        payload: bytes | None,
+        headers: dict | None,
+        parser: Callable[[dict], any] | None,
+        priority: int,
+    ) -> any:
+        """Send a request and decode the response.
+
+        Waits for a slot of the request scheduler first, the timeout only
+        covers the request itself.
+        """
         try:
-            async with async_timeout.timeout(10):
+            async with self._scheduler.slot(priority), async_timeout.timeout(10):
                 response = await self._session.request(
                     method=method,
                     url=url,
                     headers=headers,
-                    json=data,
+                    data=payload,
                 )
                 if response.status in (401, 403):
                     raise NotionApiClientAuthenticationError(
                         "Invalid credentials",
                     )
                 response.raise_for_status()
-                return await response.json()
+                body = await response.read()
+            if len(body) >= self.executor_decode_threshold:
+                return await asyncio.get_running_loop().run_in_executor(
+                    None, self._decode, body, parser
+                )
+            return self._decode(body, parser)
 
         except asyncio.TimeoutError as exception:
             raise NotionApiClientCommunicationError(
@@ -259,4 +552,10 @@ class NotionApiClient:
         except Exception as exception:  # pylint: disable=broad-except
             raise NotionApiClientError(
                 "Something really wrong happened!"
-            ) from exception
\ No newline at end of file
+            ) from exception
+
+    @staticmethod
+    def _decode(body: bytes, parser: Callable[[dict], any] | None) -> any:
+        """Decode a response body and apply the parser."""
+        data = codec.loads(body)
+        return parser(data) if parser else data
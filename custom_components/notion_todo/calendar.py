@@ -0,0 +1,128 @@
+"""A calendar platform for Notion."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .coordinator import NotionDataUpdateCoordinator
+from .task_index import NotionTask
+
+# Tasks with a due time are shown as short events starting at that time
+TIMED_TASK_DURATION = timedelta(minutes=30)
+# Longest event of the index (date-only tasks span one day)
+MAX_EVENT_DURATION = timedelta(days=1)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up the calendar platform config entry."""
+    coordinator: NotionDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities([NotionCalendarEntity(coordinator, 'Notion Tasks')])
+
+
+def _task_event(task: NotionTask) -> CalendarEvent:
+    """Create a calendar event for a task with a due date."""
+    if 'T' in task.due:
+        start = datetime.fromisoformat(task.due)
+        end = start + TIMED_TASK_DURATION
+    else:
+        start = date.fromisoformat(task.due)
+        end = start + timedelta(days=1)
+    return CalendarEvent(
+        start=start,
+        end=end,
+        summary=task.title.strip(),
+        description=f"Project: {', '.join(task.project_names)}" if task.project_names else None,
+        uid=task.id,
+    )
+
+
+class DueIntervalIndex:
+    """Calendar events of the tasks sorted by start, for bisect range queries."""
+
+    def __init__(self, tasks: Iterable[NotionTask]) -> None:
+        """Build the index from the tasks that have a due date."""
+        events = sorted(
+            (
+                event.start_datetime_local.timestamp(),
+                event.end_datetime_local.timestamp(),
+                event.uid,
+                event,
+            )
+            for event in (_task_event(task) for task in tasks if task.due)
+        )
+        self._starts = [start for start, _, _, _ in events]
+        self._ends = [end for _, end, _, _ in events]
+        self._events = [event for _, _, _, event in events]
+
+    def between(self, start: datetime, end: datetime) -> list[CalendarEvent]:
+        """Return the events overlapping [start, end)."""
+        start_ts = start.timestamp()
+        # No event lasts longer than MAX_EVENT_DURATION, so earlier starts cannot overlap
+        lo = bisect_left(self._starts, start_ts - MAX_EVENT_DURATION.total_seconds())
+        hi = bisect_left(self._starts, end.timestamp())
+        return [
+            self._events[pos] for pos in range(lo, hi)
+            if self._ends[pos] > start_ts
+        ]
+
+    def next_event(self, now: datetime) -> CalendarEvent | None:
+        """Return the event in progress or the next upcoming one."""
+        now_ts = now.timestamp()
+        pos = bisect_left(self._starts, now_ts - MAX_EVENT_DURATION.total_seconds())
+        for pos in range(pos, len(self._events)):
+            if self._ends[pos] > now_ts:
+                return self._events[pos]
+        return None
+
+
+class NotionCalendarEntity(CoordinatorEntity[NotionDataUpdateCoordinator], CalendarEntity):
+    """A Notion CalendarEntity showing tasks on their due dates."""
+
+    def __init__(
+        self,
+        coordinator: NotionDataUpdateCoordinator,
+        name: str,
+    ) -> None:
+        """Initialize CalendarEntity."""
+        super().__init__(coordinator=coordinator)
+        self._attr_unique_id = f"{name.lower().replace(' ', '_')}_{coordinator.config_entry.entry_id}"
+        self._attr_name = name
+        self._index: DueIntervalIndex | None = None
+
+    @property
+    def _due_index(self) -> DueIntervalIndex:
+        """Return the interval index, building it after a coordinator update."""
+        if self._index is None:
+            self._index = DueIntervalIndex(self.coordinator.index.tasks.values())
+        return self._index
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the next upcoming event."""
+        return self._due_index.next_event(dt_util.now())
+
+    async def async_get_events(
+        self,
+        hass: HomeAssistant,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> list[CalendarEvent]:
+        """Return calendar events within a datetime range."""
+        return self._due_index.between(start_date, end_date)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._index = None
+        super()._handle_coordinator_update()
@@ -4,6 +4,7 @@ from __future__ import annotations
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_ACCESS_TOKEN
+from homeassistant.core import callback
 from homeassistant.helpers import selector
 from homeassistant.helpers.aiohttp_client import async_create_clientsession
 
@@ -12,8 +13,19 @@ from .api import (
     NotionApiClientAuthenticationError,
     NotionApiClientCommunicationError,
     NotionApiClientError,
+    NotionApiClientSchemaError,
+)
+from .const import (
+    DOMAIN,
+    LOGGER,
+    CONF_DATABASE_ID,
+    CONF_DUE_LEAD_TIME,
+    CONF_FULL_REFRESH_INTERVAL,
+    CONF_PROPERTY_MAP,
+    CONF_SQLITE_MIRROR,
+    DEFAULT_DUE_LEAD_TIME,
+    DEFAULT_FULL_REFRESH_INTERVAL,
 )
-from .const import DOMAIN, LOGGER, CONF_DATABASE_ID
 
 
 class NotionTodoConfigFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
@@ -21,6 +33,14 @@ class NotionTodoConfigFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> NotionTodoOptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return NotionTodoOptionsFlowHandler(config_entry)
+
     async def async_step_user(
         self,
         user_input: dict | None = None,
@@ -30,7 +50,7 @@ class NotionTodoConfigFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             try:
 
-                await self._test_credentials(
+                property_map = await self._test_credentials(
                     token=user_input[CONF_ACCESS_TOKEN],
                     database_id=user_input[CONF_DATABASE_ID]
                 )
@@ -40,13 +60,16 @@ class NotionTodoConfigFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             except NotionApiClientCommunicationError as exception:
                 LOGGER.error(exception)
                 _errors["base"] = "connection"
+            except NotionApiClientSchemaError as exception:
+                LOGGER.warning(exception)
+                _errors["base"] = "schema"
             except NotionApiClientError as exception:
                 LOGGER.exception(exception)
                 _errors["base"] = "unknown"
             else:
                 return self.async_create_entry(
                     title=user_input[CONF_DATABASE_ID],
-                    data=user_input,
+                    data={**user_input, CONF_PROPERTY_MAP: property_map},
                 )
 
         return self.async_show_form(
@@ -71,7 +94,68 @@ class NotionTodoConfigFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
             errors=_errors,
         )
 
-    async def _test_credentials(self, token: str, database_id: str) -> None:
-        """Validate credentials."""
+    async def _test_credentials(self, token: str, database_id: str) -> dict[str, dict]:
+        """Validate credentials and resolve the task properties with one schema request."""
         client = NotionApiClient(token=token, database_id=database_id, session=async_create_clientsession(self.hass))
-        await client.async_get_data()
+        return await client.async_get_property_map()
+
+
+class NotionTodoOptionsFlowHandler(config_entries.OptionsFlow):
+    """Options flow for Notion ToDo."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(
+        self,
+        user_input: dict | None = None,
+    ) -> config_entries.FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(
+                title="",
+                data={
+                    CONF_FULL_REFRESH_INTERVAL: int(user_input[CONF_FULL_REFRESH_INTERVAL]),
+                    CONF_SQLITE_MIRROR: user_input[CONF_SQLITE_MIRROR],
+                    CONF_DUE_LEAD_TIME: int(user_input[CONF_DUE_LEAD_TIME]),
+                },
+            )
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_FULL_REFRESH_INTERVAL,
+                        default=self.config_entry.options.get(
+                            CONF_FULL_REFRESH_INTERVAL, DEFAULT_FULL_REFRESH_INTERVAL
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=5,
+                            max=1440,
+                            unit_of_measurement="min",
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                    vol.Required(
+                        CONF_SQLITE_MIRROR,
+                        default=self.config_entry.options.get(CONF_SQLITE_MIRROR, False),
+                    ): selector.BooleanSelector(),
+                    vol.Required(
+                        CONF_DUE_LEAD_TIME,
+                        default=self.config_entry.options.get(
+                            CONF_DUE_LEAD_TIME, DEFAULT_DUE_LEAD_TIME
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0,
+                            max=1440,
+                            unit_of_measurement="min",
+                            mode=selector.NumberSelectorMode.BOX,
+                        ),
+                    ),
+                }
+            ),
+        )
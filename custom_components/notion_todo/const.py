@@ -11,6 +11,15 @@ ATTRIBUTION = "Data provided by https://api.notion.com/v1"
 NOTION_URL = "https://api.notion.com/v1"
 NOTION_VERSION = "2022-02-22"
 CONF_DATABASE_ID = "database_id"
+CONF_PROPERTY_MAP = "property_map"
+CONF_FULL_REFRESH_INTERVAL = "full_refresh_interval"
+DEFAULT_FULL_REFRESH_INTERVAL = 30  # minutes
+CONF_SQLITE_MIRROR = "sqlite_mirror"
+CONF_DUE_LEAD_TIME = "due_lead_time"
+DEFAULT_DUE_LEAD_TIME = 0  # minutes
+EVENT_TASK_CHANGED = f"{DOMAIN}_task_changed"
+EVENT_TASK_DUE = f"{DOMAIN}_task_due"
+EVENT_WRITE_DROPPED = f"{DOMAIN}_write_dropped"
 TASK_DATE_PROPERTY = "notion%3A%2F%2Ftasks%2Fdue_date_property"
 TASK_ASSIGNEE_PROPERTY = "notion%3A%2F%2Ftasks%2Fassign_property"
 TASK_STATUS_PROPERTY = "notion%3A%2F%2Ftasks%2Fstatus_property"
@@ -19,5 +28,8 @@ TASK_COMPLETED_PROPERTY = "ex%40c"
 TASK_FROG_PROPERTY = "npi%5E"
 TASK_WEEKEND_PROPERTY = "%3CRL%3A"
 TASK_10MIN_PROPERTY = "uUq%5B"
-TASK_PROJECT_PROPERTY = "%3D%60CR"  
-
+TASK_PROJECT_PROPERTY = "%3D%60CR"
+STATUS_IN_PROGRESS = 'In_progress'
+STATUS_ARCHIVED = 'Paused'
+STATUS_DONE = 'Done'
+STATUS_NOT_STARTED = 'Not_started'
@@ -1,22 +1,42 @@
 """DataUpdateCoordinator for notion_todo."""
 from __future__ import annotations
 
-from datetime import timedelta
+from dataclasses import replace
+from datetime import datetime, timedelta
+from functools import partial
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.util import dt as dt_util
 
 from .api import (
     NotionApiClient,
     NotionApiClientAuthenticationError,
     NotionApiClientError,
 )
-from .const import DOMAIN, LOGGER
+from .const import (
+    CONF_DUE_LEAD_TIME,
+    CONF_FULL_REFRESH_INTERVAL,
+    DEFAULT_DUE_LEAD_TIME,
+    DEFAULT_FULL_REFRESH_INTERVAL,
+    DOMAIN,
+    EVENT_TASK_CHANGED,
+    LOGGER,
+)
+from .dedupe import CreateTaskDeduplicator
+from .due_timer import DueTimer
+from .events import task_events
+from .mirror import TaskMirror
+from .outbox import WriteOutbox, without_local
+from .page_content import PageContentCache
+from .relation_cache import RelationTitleCache
+from .schema import DEFAULT_PROPERTY_MAP
+from .task_index import NotionTask, TaskChanges, TaskCounts, TaskIndex, decode_tasks
 
 
 # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
@@ -32,18 +52,140 @@ class NotionDataUpdateCoordinator(DataUpdateCoordinator):
     ) -> None:
         """Initialize."""
         self.client = client
+        self.index = TaskIndex()
+        self.counts = TaskCounts()
+        self.changes = TaskChanges()
+        self.contents = PageContentCache(client)
+        self.dedupe = CreateTaskDeduplicator(self.index)
+        self.mirror: TaskMirror | None = None
+        # Open tasks due before today, which the task query does not cover
+        self.overdue_count = 0
         super().__init__(
             hass=hass,
             logger=LOGGER,
             name=DOMAIN,
             update_interval=timedelta(minutes=5),
         )
+        self.relations = RelationTitleCache(hass, client, self.config_entry.entry_id)
+        self._full_refresh_interval = timedelta(minutes=self.config_entry.options.get(
+            CONF_FULL_REFRESH_INTERVAL, DEFAULT_FULL_REFRESH_INTERVAL
+        ))
+        self.due_timer = DueTimer(
+            hass,
+            self.config_entry.entry_id,
+            timedelta(minutes=self.config_entry.options.get(CONF_DUE_LEAD_TIME, DEFAULT_DUE_LEAD_TIME)),
+        )
+        # One parser for all queries, so concurrent refreshes share one request
+        self._parser = partial(decode_tasks, property_map=client.property_map or DEFAULT_PROPERTY_MAP)
+        self.outbox = WriteOutbox(hass, self, self.config_entry.entry_id)
+        # Tasks of the last full query, before the queued writes are applied
+        self._synced_tasks: list[NotionTask] = []
+        self._force_full_refresh = False
+        # Newest last_edited_time seen by the probe before the last full query
+        self._synced_edit: str | None = None
+        self._last_full_refresh: datetime | None = None
+        self._overdue_refreshed: datetime | None = None
+
+    async def async_full_refresh(self) -> None:
+        """Refresh with a full query, even if the change probe sees no change.
+
+        Used after writes: Notion reports last_edited_time in whole minutes,
+        so the probe alone can miss an edit made within the same minute.
+        """
+        self._force_full_refresh = True
+        await self.async_refresh()
+
+    def _unchanged_since_sync(self, latest_edit: str | None) -> bool:
+        """Return True if the probe shows no change since the last full query."""
+        if self.data is None or self._force_full_refresh or self._last_full_refresh is None:
+            return False
+        now = dt_util.utcnow()
+        if now - self._last_full_refresh >= self._full_refresh_interval:
+            return False
+        # The query filters on today, and archived pages never show up in the probe
+        if dt_util.as_local(self._last_full_refresh).date() != dt_util.now().date():
+            return False
+        if latest_edit is None or latest_edit != self._synced_edit:
+            return False
+        # An edit within the same minute as the last full query would have the same timestamp
+        return datetime.fromisoformat(latest_edit) + timedelta(minutes=1) <= self._last_full_refresh
+
+    def _overdue_count_stale(self, now: datetime) -> bool:
+        """Return True if the overdue count needs a query of its own.
 
-    async def _async_update_data(self):
+        Tasks only become overdue when the date changes. Overdue tasks edited
+        in Notion are picked up within the full refresh interval, so the
+        full queries after writes do not page through the overdue backlog.
+        """
+        if self._overdue_refreshed is None:
+            return True
+        if dt_util.as_local(self._overdue_refreshed).date() != dt_util.as_local(now).date():
+            return True
+        return now - self._overdue_refreshed >= self._full_refresh_interval
+
+    async def _async_update_data(self) -> list[NotionTask]:
         """Update data via library."""
+        started = dt_util.utcnow()
         try:
-            return await self.client.async_get_data()
+            latest_edit = await self.client.async_get_last_edited_time()
+            if self._unchanged_since_sync(latest_edit):
+                LOGGER.debug("No change since %s, skipping the full query", latest_edit)
+                self.changes = TaskChanges()
+                if self.mirror is not None:
+                    # Completions still age out of the last 7 days
+                    await self.mirror.async_sync(self.changes)
+                self.outbox.async_schedule_replay()
+                return self.data
+            # JSON and property decoding of large results runs off the event loop
+            tasks = await self.client.async_get_data(parser=self._parser)
+            if self._overdue_count_stale(started):
+                self.overdue_count = await self.client.async_get_overdue_count()
+                self._overdue_refreshed = started
         except NotionApiClientAuthenticationError as exception:
             raise ConfigEntryAuthFailed(exception) from exception
         except NotionApiClientError as exception:
             raise UpdateFailed(exception) from exception
+        self._force_full_refresh = False
+        self._synced_edit = latest_edit
+        self._last_full_refresh = started
+
+        # Only ids never seen before (or expired) cause requests here
+        await self.relations.async_resolve(
+            {project_id for task in tasks for project_id in task.project}
+        )
+        self._synced_tasks = [
+            replace(task, project_names=tuple(self.relations.titles(task.project)))
+            for task in tasks
+        ]
+        tasks = self.outbox.overlay(self._synced_tasks)
+        synced = self._apply_changes(tasks)
+        if self.mirror is not None:
+            await self.mirror.async_sync(synced)
+        self.outbox.async_schedule_replay()
+        return tasks
+
+    @callback
+    def async_apply_outbox(self) -> None:
+        """Show the queued writes in the tasks without waiting for a sync."""
+        tasks = self.outbox.overlay(self._synced_tasks)
+        synced = self._apply_changes(tasks)
+        if self.mirror is not None:
+            self.hass.async_create_task(self.mirror.async_sync(synced))
+        self.async_set_updated_data(tasks)
+
+    def _apply_changes(self, tasks: list[NotionTask]) -> TaskChanges:
+        """Update the index and derived state, return the changes of tasks that exist in Notion."""
+        self.changes = self.index.update(tasks)
+        self.counts.apply(self.changes)
+        self.due_timer.apply(self.changes)
+        synced = without_local(self.changes)
+        # The first sync only loads the existing tasks
+        if self.data is not None:
+            self._fire_task_events(synced)
+        return synced
+
+    def _fire_task_events(self, changes: TaskChanges) -> None:
+        """Fire one event per change of a task since the previous sync."""
+        entry_id = self.config_entry.entry_id
+        for data in task_events(changes, dt_util.now().date()):
+            self.hass.bus.async_fire(EVENT_TASK_CHANGED, {"entry_id": entry_id, **data})
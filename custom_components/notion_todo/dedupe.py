@@ -0,0 +1,101 @@
+"""Idempotency layer for creating tasks."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+import time
+
+from .api import NotionApiClientError
+from .task_index import TaskIndex
+
+# Seconds within which an identical create_task call returns the existing task
+DEFAULT_DEDUPE_WINDOW = 300
+# Longest window that can be requested, bounds the memory of recent creates
+MAX_DEDUPE_WINDOW = 24 * 60 * 60
+
+
+def create_key(title: str, due: str | None, project: str | None) -> tuple[str, str | None, str | None]:
+    """Return the idempotency key of a task."""
+    return (
+        " ".join(title.split()).casefold(),
+        due[:10] if due else None,
+        project.strip().casefold() if project else None,
+    )
+
+
+class CreateTaskDeduplicator:
+    """Collapse repeated creates of the same task into one page.
+
+    A create is considered a duplicate if a task with the same normalized
+    title, due date and project was created within the window, either by an
+    earlier call (in flight or finished) or according to the synced tasks.
+    """
+
+    def __init__(self, index: TaskIndex) -> None:
+        """Initialize the deduplicator."""
+        self._index = index
+        self._in_flight: dict[tuple, asyncio.Future[str]] = {}
+        self._recent: dict[tuple, tuple[str, float]] = {}
+
+    async def async_create(
+        self,
+        title: str,
+        due: str | None,
+        project: str | None,
+        window: float,
+        create: Callable[[], Awaitable[str]],
+    ) -> tuple[str, bool]:
+        """Create the task unless it is a duplicate.
+
+        Returns the page id and whether a new page was created.
+        """
+        if window <= 0:
+            return await create(), True
+
+        key = create_key(title, due, project)
+        now = time.time()
+        self._prune(now)
+        if (future := self._in_flight.get(key)) is not None:
+            return await asyncio.shield(future), False
+        recent = self._recent.get(key)
+        if recent is not None and now - recent[1] <= window:
+            return recent[0], False
+        if (page_id := self._find_synced(key, now - window)) is not None:
+            return page_id, False
+
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            page_id = await create()
+        except Exception as exception:
+            future.set_exception(exception)
+            # Mark the exception as retrieved in case no duplicate is waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(page_id)
+        finally:
+            del self._in_flight[key]
+            if not future.done():
+                # Cancelled, don't leave duplicates waiting for a result that never comes
+                future.set_exception(NotionApiClientError("The create_task call was cancelled"))
+                future.exception()
+        self._recent[key] = (page_id, now)
+        return page_id, True
+
+    def _find_synced(self, key: tuple, created_after: float) -> str | None:
+        """Return the id of a synced task matching key created after a timestamp."""
+        for task in self._index.search(text=key[0]):
+            if not task.created_time:
+                continue
+            if create_key(task.title, task.due, task.omnifocus_project) != key:
+                continue
+            if datetime.fromisoformat(task.created_time).timestamp() >= created_after:
+                return task.id
+        return None
+
+    def _prune(self, now: float) -> None:
+        expired = [key for key, (_, created) in self._recent.items() if now - created > MAX_DEDUPE_WINDOW]
+        for key in expired:
+            del self._recent[key]
@@ -0,0 +1,129 @@
+"""Events at the due time of timed tasks."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import heapq
+import itertools
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .const import EVENT_TASK_DUE
+from .task_index import NotionTask, TaskChanges
+
+# Rebuild the heap once stale entries outnumber the scheduled ones by this much
+COMPACT_THRESHOLD = 64
+
+
+def due_time(task: NotionTask) -> datetime | None:
+    """Return the due time of a task with a timed due date."""
+    if not task.due or 'T' not in task.due:
+        return None
+    due = dt_util.parse_datetime(task.due)
+    if due is None:
+        return None
+    if due.tzinfo is None:
+        due = due.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    return dt_util.as_utc(due)
+
+
+class DueTimer:
+    """Fire an event at the (lead adjusted) due time of each open timed task.
+
+    Upcoming fire times are kept in a min-heap with a single armed timer for
+    the earliest one. Changed tasks push a new entry and invalidate the old
+    one, which is dropped lazily when it reaches the top of the heap.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, lead: timedelta) -> None:
+        """Initialize the timer."""
+        self._hass = hass
+        self._entry_id = entry_id
+        self._lead = lead
+        self._heap: list[tuple[float, int, str]] = []
+        # Current entry of each scheduled task: (fire timestamp, sequence, task)
+        self._scheduled: dict[str, tuple[float, int, NotionTask]] = {}
+        self._seq = itertools.count()
+        self._armed: float | None = None
+        self._unsub: Callable[[], None] | None = None
+
+    @callback
+    def apply(self, changes: TaskChanges) -> None:
+        """Schedule, move or drop the tasks that changed in a sync."""
+        now = dt_util.utcnow().timestamp()
+        for task in [*changes.added, *(new for _, new in changes.updated)]:
+            self._schedule(task, now)
+        for task in changes.removed:
+            self._scheduled.pop(task.id, None)
+        if len(self._heap) > 2 * len(self._scheduled) + COMPACT_THRESHOLD:
+            self._heap = [(ts, seq, task_id) for task_id, (ts, seq, _) in self._scheduled.items()]
+            heapq.heapify(self._heap)
+        self._arm()
+
+    def _schedule(self, task: NotionTask, now: float) -> None:
+        due = due_time(task) if task.is_open else None
+        fire = (due - self._lead).timestamp() if due else None
+        if fire is None or fire <= now:
+            self._scheduled.pop(task.id, None)
+            return
+        current = self._scheduled.get(task.id)
+        if current is not None and current[0] == fire:
+            # Same time, keep the heap entry and refresh the event data
+            self._scheduled[task.id] = (fire, current[1], task)
+            return
+        seq = next(self._seq)
+        self._scheduled[task.id] = (fire, seq, task)
+        heapq.heappush(self._heap, (fire, seq, task.id))
+
+    def _is_current(self, fire: float, seq: int, task_id: str) -> bool:
+        current = self._scheduled.get(task_id)
+        return current is not None and current[1] == seq
+
+    def _arm(self) -> None:
+        """Arm the timer for the earliest scheduled task."""
+        while self._heap and not self._is_current(*self._heap[0]):
+            heapq.heappop(self._heap)
+        fire = self._heap[0][0] if self._heap else None
+        if fire == self._armed:
+            return
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        self._armed = fire
+        if fire is not None:
+            self._unsub = async_track_point_in_utc_time(
+                self._hass, self._handle_timer, dt_util.utc_from_timestamp(fire)
+            )
+
+    @callback
+    def _handle_timer(self, now: datetime) -> None:
+        """Fire the events of all tasks that are due."""
+        self._unsub = None
+        self._armed = None
+        timestamp = now.timestamp()
+        while self._heap and self._heap[0][0] <= timestamp:
+            fire, seq, task_id = heapq.heappop(self._heap)
+            if not self._is_current(fire, seq, task_id):
+                continue
+            task = self._scheduled.pop(task_id)[2]
+            self._hass.bus.async_fire(
+                EVENT_TASK_DUE,
+                {
+                    "entry_id": self._entry_id,
+                    "uid": task.id,
+                    "summary": task.title.strip(),
+                    "due": task.due,
+                    "lead_minutes": int(self._lead.total_seconds() // 60),
+                },
+            )
+        self._arm()
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the armed timer."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        self._armed = None
@@ -0,0 +1,46 @@
+"""Per task change events computed between two syncs."""
+from __future__ import annotations
+
+from datetime import date
+
+from .const import STATUS_DONE
+from .task_index import FLAGS, NotionTask, TaskChanges
+
+CHANGE_CREATED = "created"
+CHANGE_COMPLETED = "completed"
+CHANGE_DUE_CHANGED = "due_changed"
+CHANGE_FLAG_CHANGED = "flag_changed"
+CHANGE_DELETED = "deleted"
+
+
+def _event(change: str, task: NotionTask, **data) -> dict:
+    return {"type": change, "uid": task.id, "summary": task.title.strip(), **data}
+
+
+def task_events(changes: TaskChanges, today: date) -> list[dict]:
+    """Return the data of one event per change of a task.
+
+    An updated task yields one event for each kind of change it went through.
+    Tasks that only left the synced window because they are due before today
+    are not reported as deleted.
+    """
+    events = [
+        _event(CHANGE_CREATED, task, status=task.status, due=task.due)
+        for task in changes.added
+    ]
+    for old, new in changes.updated:
+        if new.status == STATUS_DONE and old.status != STATUS_DONE:
+            events.append(_event(CHANGE_COMPLETED, new, due=new.due))
+        if new.due != old.due:
+            events.append(_event(CHANGE_DUE_CHANGED, new, due=new.due, old_due=old.due))
+        events.extend(
+            _event(CHANGE_FLAG_CHANGED, new, flag=flag, value=flag in new.flags)
+            for flag in FLAGS
+            if (flag in new.flags) != (flag in old.flags)
+        )
+    events.extend(
+        _event(CHANGE_DELETED, task)
+        for task in changes.removed
+        if not task.due_date or date.fromisoformat(task.due_date) >= today
+    )
+    return events
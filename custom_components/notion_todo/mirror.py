@@ -0,0 +1,183 @@
+"""Local SQLite mirror of the synced tasks for history queries."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+import sqlite3
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, LOGGER
+from .task_index import (
+    CLOSED_STATUSES,
+    FLAG_COMPLETED,
+    FLAG_FROG,
+    FLAG_QUICK,
+    FLAG_WEEKEND,
+    NotionTask,
+    TaskChanges,
+)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS tasks (
+        id TEXT PRIMARY KEY,
+        title TEXT NOT NULL,
+        status TEXT,
+        due TEXT,
+        due_date TEXT,
+        is_frog INTEGER NOT NULL DEFAULT 0,
+        is_weekend INTEGER NOT NULL DEFAULT 0,
+        is_quick INTEGER NOT NULL DEFAULT 0,
+        is_completed INTEGER NOT NULL DEFAULT 0,
+        project TEXT,
+        created_time TEXT,
+        last_edited_time TEXT,
+        completed_at TEXT,
+        in_window INTEGER NOT NULL DEFAULT 1
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status)",
+    "CREATE INDEX IF NOT EXISTS tasks_due_date ON tasks (due_date)",
+    "CREATE INDEX IF NOT EXISTS tasks_flags ON tasks (is_frog, is_weekend, is_quick, is_completed)",
+    "CREATE INDEX IF NOT EXISTS tasks_project ON tasks (project)",
+    "CREATE INDEX IF NOT EXISTS tasks_last_edited_time ON tasks (last_edited_time)",
+    "CREATE INDEX IF NOT EXISTS tasks_completed_at ON tasks (completed_at)",
+)
+
+# A closed task keeps the completed_at of the sync that first saw it closed
+_UPSERT = """
+    INSERT INTO tasks (
+        id, title, status, due, due_date, is_frog, is_weekend, is_quick,
+        is_completed, project, created_time, last_edited_time, completed_at, in_window
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
+    ON CONFLICT(id) DO UPDATE SET
+        title = excluded.title,
+        status = excluded.status,
+        due = excluded.due,
+        due_date = excluded.due_date,
+        is_frog = excluded.is_frog,
+        is_weekend = excluded.is_weekend,
+        is_quick = excluded.is_quick,
+        is_completed = excluded.is_completed,
+        project = excluded.project,
+        created_time = excluded.created_time,
+        last_edited_time = excluded.last_edited_time,
+        completed_at = CASE
+            WHEN excluded.completed_at IS NULL THEN NULL
+            ELSE COALESCE(tasks.completed_at, excluded.completed_at)
+        END,
+        in_window = 1
+"""
+
+
+def _row(task: NotionTask) -> tuple:
+    return (
+        task.id,
+        task.title.strip(),
+        task.status,
+        task.due,
+        task.due_date,
+        FLAG_FROG in task.flags,
+        FLAG_WEEKEND in task.flags,
+        FLAG_QUICK in task.flags,
+        FLAG_COMPLETED in task.flags,
+        ", ".join(task.project_names or task.project) or None,
+        task.created_time,
+        task.last_edited_time,
+        task.last_edited_time if task.status in CLOSED_STATUSES else None,
+    )
+
+
+def _iso(value: datetime) -> str:
+    """Format a datetime like Notion timestamps, so they compare as strings."""
+    return value.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+class TaskMirror:
+    """Keep the synced tasks in a local SQLite database.
+
+    Every sync is written as one batched transaction in an executor thread.
+    Tasks that drop out of the synced window (e.g. past due dates) are kept
+    with in_window = 0, so history survives beyond the query filter.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the mirror."""
+        self._hass = hass
+        self._path = hass.config.path(f"{DOMAIN}_{entry_id}.db")
+        self._connection: sqlite3.Connection | None = None
+        # Serializes the executor jobs using the connection
+        self._lock = asyncio.Lock()
+        self.completed_last_7_days = 0
+
+    async def async_setup(self) -> None:
+        """Open the database and create the schema."""
+        async with self._lock:
+            await self._hass.async_add_executor_job(self._setup)
+
+    def _setup(self) -> None:
+        self._connection = sqlite3.connect(self._path, check_same_thread=False)
+        with self._connection:
+            for statement in _SCHEMA:
+                self._connection.execute(statement)
+        self.completed_last_7_days = self._completed_since(datetime.now(timezone.utc) - timedelta(days=7))
+
+    async def async_close(self) -> None:
+        """Close the database."""
+        async with self._lock:
+            if self._connection is not None:
+                await self._hass.async_add_executor_job(self._connection.close)
+                self._connection = None
+
+    async def async_sync(self, changes: TaskChanges) -> None:
+        """Write the changes of one sync and update the completed count.
+
+        The count moves with time as well, so it is updated even without changes.
+        """
+        if self._connection is None:
+            return
+        async with self._lock:
+            try:
+                await self._hass.async_add_executor_job(self._sync, changes)
+            except sqlite3.Error as exception:
+                LOGGER.error("Unable to update the task mirror: %s", exception)
+
+    def _sync(self, changes: TaskChanges) -> None:
+        if changes:
+            self._write(changes)
+        self.completed_last_7_days = self._completed_since(datetime.now(timezone.utc) - timedelta(days=7))
+
+    def _write(self, changes: TaskChanges) -> None:
+        with self._connection:
+            self._connection.executemany(
+                _UPSERT,
+                [_row(task) for task in changes.added] + [_row(new) for _, new in changes.updated],
+            )
+            self._connection.executemany(
+                "UPDATE tasks SET in_window = 0 WHERE id = ?",
+                [(task.id,) for task in changes.removed],
+            )
+
+    def _completed_since(self, since: datetime) -> int:
+        return self._connection.execute(
+            "SELECT COUNT(*) FROM tasks WHERE completed_at >= ?", (_iso(since),)
+        ).fetchone()[0]
+
+    async def async_completed_per_week(self, weeks: int) -> list[dict]:
+        """Return the number of completed tasks per ISO week, oldest first."""
+        if self._connection is None:
+            return []
+        async with self._lock:
+            return await self._hass.async_add_executor_job(self._completed_per_week, weeks)
+
+    def _completed_per_week(self, weeks: int) -> list[dict]:
+        since = datetime.now(timezone.utc) - timedelta(weeks=weeks)
+        counts: dict[str, int] = {}
+        for (completed_at,) in self._connection.execute(
+            "SELECT completed_at FROM tasks WHERE completed_at >= ?", (_iso(since),)
+        ):
+            year, week, _ = datetime.fromisoformat(completed_at).isocalendar()
+            key = f"{year}-W{week:02d}"
+            counts[key] = counts.get(key, 0) + 1
+        return [{"week": week, "completed": count} for week, count in sorted(counts.items())]
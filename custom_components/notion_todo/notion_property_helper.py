@@ -14,6 +14,17 @@ class NotionPropertyHelper:
         key = NotionPropertyHelper._get_property_key_by_id(id, data)
         return NotionPropertyHelper._property(data['properties'][key])
 
+    @staticmethod
+    def get_property_by_name(name, id, data):
+        """Get property by name, fall back to id if it was renamed. None if missing."""
+        prop = data['properties'].get(name) if name else None
+        if prop is None or prop.get('id') != id:
+            key = NotionPropertyHelper._get_property_key_by_id(id, data)
+            if key is None:
+                return None
+            prop = data['properties'][key]
+        return NotionPropertyHelper._property(prop)
+
     @staticmethod
     def set_property_by_id(id, value, data):
         """Set property by id."""
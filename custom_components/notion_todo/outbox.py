@@ -0,0 +1,327 @@
+"""Durable outbox for writes made while Notion is unreachable."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import replace
+from typing import TYPE_CHECKING
+import uuid
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .api import NotionApiClientCommunicationError, NotionApiClientError
+from .const import DOMAIN, EVENT_WRITE_DROPPED, LOGGER
+from .scheduler import PRIORITY_BACKGROUND
+from .task_index import FLAG_QUICK, NotionTask, TaskChanges
+
+if TYPE_CHECKING:
+    from .coordinator import NotionDataUpdateCoordinator
+
+STORAGE_VERSION = 1
+# Id prefix of tasks created locally that are not in Notion yet
+LOCAL_ID_PREFIX = "outbox-"
+# Writes replayed per batch, and the pause between batches
+REPLAY_BATCH_SIZE = 10
+REPLAY_BATCH_INTERVAL = 2
+# Seconds until the next replay attempt while writes are queued
+RETRY_INTERVAL = 60
+
+OP_CREATE = "create"
+OP_UPDATE = "update"
+OP_DELETE = "delete"
+
+REASON_CONFLICT = "conflict"
+REASON_REJECTED = "rejected"
+
+
+def is_transient(exception: NotionApiClientError) -> bool:
+    """Return True for errors a later retry can fix (no connection, timeouts, 429 and 5xx)."""
+    if not isinstance(exception, NotionApiClientCommunicationError):
+        return False
+    cause = exception.__cause__
+    if isinstance(cause, aiohttp.ClientResponseError):
+        return cause.status == 429 or cause.status >= 500
+    return True
+
+
+def without_local(changes: TaskChanges) -> TaskChanges:
+    """Return the changes without the tasks that only exist locally."""
+    return TaskChanges(
+        added=[task for task in changes.added if not task.id.startswith(LOCAL_ID_PREFIX)],
+        updated=[(old, new) for old, new in changes.updated if not new.id.startswith(LOCAL_ID_PREFIX)],
+        removed=[task for task in changes.removed if not task.id.startswith(LOCAL_ID_PREFIX)],
+    )
+
+
+class WriteOutbox:
+    """Queue writes that failed on a connection error and replay them later.
+
+    Queued writes are persisted in HA storage and shown in the synced tasks
+    right away. They are replayed in order after a successful poll (or every
+    RETRY_INTERVAL seconds), in batches that leave room for other requests.
+    An update or delete of a page edited in Notion since it was queued is a
+    conflict: it is dropped in favour of the remote change.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: NotionDataUpdateCoordinator, entry_id: str) -> None:
+        """Initialize the outbox."""
+        self._hass = hass
+        self._coordinator = coordinator
+        self._entry_id = entry_id
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.outbox")
+        self._entries: list[dict] = []
+        # Local ids of replayed creates and their pages, until the entities show the page
+        self._created: dict[str, str] = {}
+        # Entry being replayed right now, it can no longer be changed
+        self._sending: dict | None = None
+        self._replay_lock = asyncio.Lock()
+        self._unsub_retry: Callable[[], None] | None = None
+
+    @property
+    def pending(self) -> int:
+        """Return the number of queued writes."""
+        return len(self._entries)
+
+    async def async_load(self) -> None:
+        """Load the persisted writes."""
+        data = await self._store.async_load() or {}
+        self._entries = data.get('entries', [])
+        self._created = data.get('created', {})
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the scheduled retry."""
+        if self._unsub_retry is not None:
+            self._unsub_retry()
+            self._unsub_retry = None
+
+    async def async_create_task(self, **kwargs) -> tuple[str, bool]:
+        """Create a task, or queue it if Notion is unreachable.
+
+        Returns the page id (a local id while queued) and whether it was sent.
+        """
+        page, entry = await self._async_write(OP_CREATE, kwargs, self._coordinator.client.create_task)
+        if entry is not None:
+            return f"{LOCAL_ID_PREFIX}{entry['id']}", False
+        return page['id'], True
+
+    async def async_update_task(self, task_id: str, **kwargs) -> bool:
+        """Update a task, or queue the update if Notion is unreachable.
+
+        Returns whether the update was sent.
+        """
+        kwargs['task_id'] = self._resolve_local(task_id)
+        if (entry := self._queued_create(kwargs['task_id'])) is not None:
+            # Not created in Notion yet, fold the update into the queued create
+            entry['args'].update(title=kwargs['title'], status=kwargs['status'], due=kwargs['due'])
+            await self._async_save_and_apply()
+            return False
+        _, entry = await self._async_write(OP_UPDATE, kwargs, self._coordinator.client.update_task)
+        return entry is None
+
+    async def async_delete_task(self, task_id: str, **kwargs) -> bool:
+        """Delete a task, or queue the delete if Notion is unreachable.
+
+        Returns whether the delete was sent.
+        """
+        kwargs['task_id'] = self._resolve_local(task_id)
+        if (entry := self._queued_create(kwargs['task_id'])) is not None:
+            self._entries.remove(entry)
+            await self._async_save_and_apply()
+            return False
+        _, entry = await self._async_write(OP_DELETE, kwargs, self._coordinator.client.delete_task)
+        return entry is None
+
+    def _resolve_local(self, task_id: str) -> str:
+        """Return the page id of a replayed create, other ids unchanged.
+
+        The entities show the local id of a replayed create until the next
+        sync, so writes made meanwhile must go to the created page. Raises
+        NotionApiClientError for local ids that are neither queued nor created.
+        """
+        if not task_id.startswith(LOCAL_ID_PREFIX):
+            return task_id
+        if task_id in self._created:
+            return self._created[task_id]
+        if any(f"{LOCAL_ID_PREFIX}{entry['id']}" == task_id for entry in self._entries):
+            return task_id
+        raise NotionApiClientError(f"Task {task_id} is no longer queued")
+
+    def _queued_create(self, task_id: str) -> dict | None:
+        """Return the queued create of a local id, None if there is none or it is being sent.
+
+        Writes of a create being sent are queued behind it under the local
+        id, and resolved to the created page when they are replayed.
+        """
+        for entry in self._entries:
+            if entry['op'] == OP_CREATE and f"{LOCAL_ID_PREFIX}{entry['id']}" == task_id:
+                return None if entry is self._sending else entry
+        return None
+
+    async def _async_write(
+        self, op: str, args: dict, send: Callable[..., Awaitable[dict]]
+    ) -> tuple[dict | None, dict | None]:
+        """Send a write, or queue it on a connection error.
+
+        While writes are queued new ones are queued behind them, so they
+        reach Notion in order. Returns the response or the queued entry.
+        """
+        queued_behind = bool(self._entries)
+        if not queued_behind:
+            try:
+                return await send(**args), None
+            except NotionApiClientError as exception:
+                if not is_transient(exception):
+                    raise
+                LOGGER.warning("Notion is unreachable (%s), queueing the %s", exception, op)
+
+        task = self._coordinator.index.tasks.get(args.get('task_id'))
+        entry = {
+            'id': uuid.uuid4().hex,
+            'op': op,
+            'args': {key: value for key, value in args.items() if key != 'priority'},
+            'base_edited': task.last_edited_time if task else None,
+            'queued': dt_util.utcnow().isoformat(),
+        }
+        self._entries.append(entry)
+        await self._async_save_and_apply()
+        if queued_behind:
+            self.async_schedule_replay()
+        else:
+            self._schedule_retry()
+        return None, entry
+
+    async def _async_save_and_apply(self) -> None:
+        await self._store.async_save(self._data_to_save())
+        self._coordinator.async_apply_outbox()
+
+    def _data_to_save(self) -> dict:
+        return {'entries': self._entries, 'created': self._created}
+
+    def overlay(self, tasks: list[NotionTask]) -> list[NotionTask]:
+        """Return the tasks with the queued writes applied."""
+        if not self._entries:
+            return tasks
+        by_id = {task.id: task for task in tasks}
+        for entry in self._entries:
+            args = entry['args']
+            if entry['op'] == OP_CREATE:
+                task_id = f"{LOCAL_ID_PREFIX}{entry['id']}"
+                by_id[task_id] = NotionTask(
+                    id=task_id,
+                    title=args['title'],
+                    status=args['status'],
+                    due=args.get('due'),
+                    flags=frozenset({FLAG_QUICK}) if args.get('under_10_min') else frozenset(),
+                    omnifocus_project=args.get('omnifocus_project'),
+                    created_time=entry['queued'],
+                )
+            elif entry['op'] == OP_UPDATE and args['task_id'] in by_id:
+                by_id[args['task_id']] = replace(
+                    by_id[args['task_id']], title=args['title'], status=args['status'], due=args['due']
+                )
+            elif entry['op'] == OP_DELETE:
+                by_id.pop(args['task_id'], None)
+        return list(by_id.values())
+
+    @callback
+    def async_schedule_replay(self) -> None:
+        """Replay the queued writes in the background."""
+        if self._entries and not self._replay_lock.locked():
+            self._hass.async_create_task(self.async_replay())
+
+    def _schedule_retry(self) -> None:
+        if self._unsub_retry is None:
+            self._unsub_retry = async_call_later(self._hass, RETRY_INTERVAL, self._handle_retry)
+
+    @callback
+    def _handle_retry(self, _now) -> None:
+        self._unsub_retry = None
+        self.async_schedule_replay()
+
+    async def async_replay(self) -> None:
+        """Send the queued writes in order, stop at the first connection error."""
+        async with self._replay_lock:
+            sent = 0
+            while self._entries:
+                batch = self._entries[:REPLAY_BATCH_SIZE]
+                for entry in batch:
+                    self._sending = entry
+                    try:
+                        await self._async_send(entry)
+                    except NotionApiClientError as exception:
+                        if is_transient(exception):
+                            LOGGER.debug("Notion still unreachable, %s writes queued: %s", len(self._entries), exception)
+                            await self._store.async_save(self._data_to_save())
+                            self._schedule_retry()
+                            return
+                        LOGGER.error("Notion rejected the queued %s of %s: %s", entry['op'], self._describe(entry), exception)
+                        self._fire_dropped(entry, REASON_REJECTED, None)
+                    finally:
+                        self._sending = None
+                    if entry in self._entries:
+                        self._entries.remove(entry)
+                    sent += 1
+                await self._store.async_save(self._data_to_save())
+                if self._entries:
+                    await asyncio.sleep(REPLAY_BATCH_INTERVAL)
+            if sent:
+                await self._coordinator.async_full_refresh()
+            # Once synced the entities show the created pages instead of the local ids
+            self._created = {
+                local_id: page_id for local_id, page_id in self._created.items()
+                if local_id in self._coordinator.index.tasks
+            }
+
+    async def _async_send(self, entry: dict) -> None:
+        """Send one write, dropping updates and deletes of pages edited in Notion meanwhile."""
+        args = {**entry['args'], 'priority': PRIORITY_BACKGROUND}
+        client = self._coordinator.client
+        if entry['op'] == OP_CREATE:
+            page = await client.create_task(**args)
+            self._created[f"{LOCAL_ID_PREFIX}{entry['id']}"] = page['id']
+            return
+        if args['task_id'] in self._created:
+            # Queued while the create of the task was being sent
+            args['task_id'] = self._created[args['task_id']]
+
+        page = await client.async_get_page(args['task_id'], priority=PRIORITY_BACKGROUND)
+        if entry['base_edited'] is not None and page['last_edited_time'] != entry['base_edited']:
+            LOGGER.warning(
+                "%s was edited in Notion since the %s was queued, keeping the Notion version",
+                self._describe(entry), entry['op'],
+            )
+            self._fire_dropped(entry, REASON_CONFLICT, page['last_edited_time'])
+            return
+        if entry['op'] == OP_UPDATE:
+            page = await client.update_task(**args)
+            # Later writes of the same page were queued against the old version
+            for queued in self._entries:
+                if queued is not entry and queued['args'].get('task_id') == args['task_id']:
+                    queued['base_edited'] = page['last_edited_time']
+        else:
+            await client.delete_task(**args)
+
+    def _describe(self, entry: dict) -> str:
+        args = entry['args']
+        return args.get('title') or args.get('task_id')
+
+    def _fire_dropped(self, entry: dict, reason: str, remote_edited: str | None) -> None:
+        self._hass.bus.async_fire(
+            EVENT_WRITE_DROPPED,
+            {
+                "entry_id": self._entry_id,
+                "reason": reason,
+                "op": entry['op'],
+                "uid": entry['args'].get('task_id'),
+                "summary": entry['args'].get('title'),
+                "queued": entry['queued'],
+                "base_edited": entry['base_edited'],
+                "remote_edited": remote_edited,
+            },
+        )
@@ -0,0 +1,79 @@
+"""Lazily fetched and cached page bodies of Notion tasks."""
+from __future__ import annotations
+
+from collections import OrderedDict
+
+from .api import NotionApiClient
+
+# Upper bound of page bodies kept in memory
+MAX_CACHED_BODIES = 200
+# Upper bound of block pages (100 blocks each) fetched for one body
+MAX_BLOCK_PAGES = 5
+
+_BLOCK_PREFIXES = {
+    'heading_1': '# ',
+    'heading_2': '## ',
+    'heading_3': '### ',
+    'bulleted_list_item': '- ',
+    'numbered_list_item': '1. ',
+    'quote': '> ',
+}
+
+
+def block_text(block: dict) -> str | None:
+    """Return the plain text of a block, None for blocks without text."""
+    block_type = block.get('type')
+    content = block.get(block_type) or {}
+    if 'rich_text' not in content:
+        return None
+    text = ''.join(part.get('plain_text', '') for part in content['rich_text'])
+    if block_type == 'to_do':
+        return ('[x] ' if content.get('checked') else '[ ] ') + text
+    return _BLOCK_PREFIXES.get(block_type, '') + text
+
+
+class PageContentCache:
+    """Fetch page bodies on demand and keep them in a bounded LRU cache.
+
+    Entries are keyed by page id and only valid for the last_edited_time
+    they were fetched at, so an edited page is fetched again on next use.
+    """
+
+    def __init__(self, client: NotionApiClient) -> None:
+        """Initialize the cache."""
+        self._client = client
+        self._bodies: OrderedDict[str, tuple[str | None, str]] = OrderedDict()
+
+    def get(self, page_id: str, last_edited_time: str | None) -> str | None:
+        """Return a cached body without fetching it."""
+        entry = self._bodies.get(page_id)
+        if entry is None or entry[0] != last_edited_time:
+            return None
+        self._bodies.move_to_end(page_id)
+        return entry[1]
+
+    async def async_get(self, page_id: str, last_edited_time: str | None) -> str:
+        """Return the body of a page, fetching it if it is not cached."""
+        body = self.get(page_id, last_edited_time)
+        if body is not None:
+            return body
+
+        lines = []
+        cursor = None
+        for _ in range(MAX_BLOCK_PAGES):
+            response = await self._client.async_get_block_children(page_id, cursor)
+            for block in response.get('results', []):
+                text = block_text(block)
+                if text is not None:
+                    lines.append(text)
+            cursor = response.get('next_cursor')
+            if not response.get('has_more') or not cursor:
+                break
+        body = '\n'.join(lines).strip()
+
+        if last_edited_time is not None:
+            self._bodies[page_id] = (last_edited_time, body)
+            self._bodies.move_to_end(page_id)
+            while len(self._bodies) > MAX_CACHED_BODIES:
+                self._bodies.popitem(last=False)
+        return body
@@ -0,0 +1,60 @@
+"""Profiling capture of a coordinator refresh cycle."""
+from __future__ import annotations
+
+import cProfile
+import pstats
+import sys
+
+from homeassistant.exceptions import HomeAssistantError
+
+from .coordinator import NotionDataUpdateCoordinator
+
+SORT_CUMULATIVE = "cumulative"
+SORT_TOTAL = "tottime"
+SORT_KEYS = (SORT_CUMULATIVE, SORT_TOTAL)
+
+
+async def async_profile_refresh(coordinator: NotionDataUpdateCoordinator) -> cProfile.Profile:
+    """Run one refresh, including the entity updates, under cProfile.
+
+    The profiler only sees the event loop thread, so response decoding is
+    forced inline for the duration of the capture. Raises HomeAssistantError
+    if another profiler is active.
+    """
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as exception:
+        # Python 3.12+ allows one profiler at a time, e.g. HA's profiler integration
+        raise HomeAssistantError(f"Unable to start the profiler: {exception}") from exception
+    client = coordinator.client
+    threshold = client.executor_decode_threshold
+    client.executor_decode_threshold = sys.maxsize
+    try:
+        await coordinator.async_full_refresh()
+    finally:
+        profiler.disable()
+        client.executor_decode_threshold = threshold
+    return profiler
+
+
+def summarize_profile(profiler: cProfile.Profile, path: str, sort: str, top: int) -> list[dict]:
+    """Write the stats to path and return the top functions.
+
+    Does blocking I/O, run it in an executor.
+    """
+    profiler.dump_stats(path)
+    stats = pstats.Stats(profiler).stats
+    column = 3 if sort == SORT_CUMULATIVE else 2
+    hot = sorted(stats.items(), key=lambda item: item[1][column], reverse=True)[:top]
+    return [
+        {
+            "function": func_name,
+            "file": f"{file_name}:{line}",
+            "calls": calls,
+            "primitive_calls": primitive_calls,
+            "tottime": round(tottime, 6),
+            "cumtime": round(cumtime, 6),
+        }
+        for (file_name, line, func_name), (primitive_calls, calls, tottime, cumtime, _) in hot
+    ]
@@ -0,0 +1,97 @@
+"""Persistent cache resolving related Notion pages to their titles."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+import time
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .api import NotionApiClient, NotionApiClientError
+from .const import DOMAIN, LOGGER
+from .notion_property_helper import NotionPropertyHelper as propHelper
+from .outbox import is_transient
+from .scheduler import PRIORITY_BACKGROUND
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+RELATION_TTL = 24 * 60 * 60
+# Notion allows an average of three requests per second per integration
+MAX_CONCURRENT_FETCHES = 3
+
+
+def page_title(page: dict) -> str | None:
+    """Return the plain text title of a page."""
+    for prop in page.get('properties', {}).values():
+        if prop.get('type') == 'title':
+            return propHelper._property(prop).strip() or None
+    return None
+
+
+class RelationTitleCache:
+    """Resolve related page ids (e.g. projects) to page titles.
+
+    Titles are persisted in HA storage and only fetched for ids that are
+    unknown or whose entry is older than RELATION_TTL, so a regular poll
+    does not cost any extra request.
+    """
+
+    def __init__(self, hass: HomeAssistant, client: NotionApiClient, entry_id: str) -> None:
+        """Initialize the cache."""
+        self._client = client
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.relations")
+        self._titles: dict[str, tuple[str, float]] = {}
+        self._loaded = False
+
+    def title(self, page_id: str) -> str:
+        """Return the title of a page, or its id if it is not resolved (yet)."""
+        entry = self._titles.get(page_id)
+        return entry[0] if entry else page_id
+
+    def titles(self, page_ids: Iterable[str] | None) -> list[str]:
+        """Return the titles of several pages."""
+        return [self.title(page_id) for page_id in page_ids or ()]
+
+    async def async_load(self) -> None:
+        """Load the persisted titles."""
+        if self._loaded:
+            return
+        data = await self._store.async_load() or {}
+        # Persisted as JSON lists
+        self._titles = {page_id: tuple(entry) for page_id, entry in data.get('titles', {}).items()}
+        self._loaded = True
+
+    async def async_resolve(self, page_ids: Iterable[str]) -> None:
+        """Fetch the titles of unknown or expired pages in one bounded batch."""
+        await self.async_load()
+        now = time.time()
+        missing = {
+            page_id for page_id in page_ids
+            if page_id not in self._titles or now - self._titles[page_id][1] > RELATION_TTL
+        }
+        if not missing:
+            return
+
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+
+        async def fetch(page_id: str) -> None:
+            async with semaphore:
+                try:
+                    page = await self._client.async_get_page(page_id, priority=PRIORITY_BACKGROUND)
+                except NotionApiClientError as exception:
+                    LOGGER.debug("Unable to resolve related page %s: %s", page_id, exception)
+                    if is_transient(exception):
+                        # Keep the previous title, if any, and retry on the next poll
+                        return
+                    # Keep the id as title until the TTL expires, e.g. for pages
+                    # not shared with the integration, instead of retrying every poll
+                    self._titles[page_id] = (page_id, now)
+                    return
+            self._titles[page_id] = (page_title(page) or page_id, now)
+
+        await asyncio.gather(*(fetch(page_id) for page_id in missing))
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _data_to_save(self) -> dict:
+        return {'titles': {page_id: list(entry) for page_id, entry in self._titles.items()}}
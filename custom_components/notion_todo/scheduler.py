@@ -0,0 +1,117 @@
+"""Priority aware scheduling of Notion API requests."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+import itertools
+import time
+
+# Request classes, lower values are served first
+PRIORITY_INTERACTIVE = 0  # user edits from the todo card
+PRIORITY_SERVICE = 1  # service calls
+PRIORITY_POLL = 2  # coordinator polling
+PRIORITY_BACKGROUND = 3  # relation titles and other reconciliation
+
+# Notion allows an average of three requests per second per integration token
+REQUESTS_PER_SECOND = 3.0
+BURST = 3
+MAX_CONCURRENT_REQUESTS = 3
+# A waiting request is promoted by one class per AGING_SECONDS of waiting,
+# so background work is delayed under load but never starved
+AGING_SECONDS = 2.0
+
+
+@dataclass(eq=False)
+class _Waiter:
+    priority: int
+    enqueued: float
+    seq: int
+    future: asyncio.Future
+
+
+class RequestScheduler:
+    """Token bucket shared by the requests of a client, served by priority."""
+
+    def __init__(
+        self,
+        rate: float = REQUESTS_PER_SECOND,
+        burst: int = BURST,
+        max_concurrent: int = MAX_CONCURRENT_REQUESTS,
+    ) -> None:
+        """Initialize the scheduler."""
+        self._rate = rate
+        self._burst = burst
+        self._max_concurrent = max_concurrent
+        self._tokens = float(burst)
+        self._refilled = time.monotonic()
+        self._running = 0
+        self._waiters: list[_Waiter] = []
+        self._seq = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+
+    @asynccontextmanager
+    async def slot(self, priority: int) -> AsyncIterator[None]:
+        """Wait for the turn of a request of the given class."""
+        await self._acquire(priority)
+        try:
+            yield
+        finally:
+            self._running -= 1
+            self._dispatch()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self._burst, self._tokens + (now - self._refilled) * self._rate)
+        self._refilled = now
+
+    async def _acquire(self, priority: int) -> None:
+        now = time.monotonic()
+        self._refill(now)
+        if not self._waiters and self._running < self._max_concurrent and self._tokens >= 1:
+            self._tokens -= 1
+            self._running += 1
+            return
+
+        waiter = _Waiter(priority, now, next(self._seq), asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        # Arms the refill timer if nothing running would dispatch the waiter
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            elif not waiter.future.cancelled():
+                # Granted a slot but cancelled before using it
+                self._running -= 1
+            self._dispatch()
+            raise
+
+    def _effective_priority(self, waiter: _Waiter, now: float) -> tuple[float, int]:
+        return (waiter.priority - (now - waiter.enqueued) / AGING_SECONDS, waiter.seq)
+
+    def _dispatch(self) -> None:
+        """Grant slots to the most urgent waiters the budget allows."""
+        now = time.monotonic()
+        self._refill(now)
+        self._waiters = [waiter for waiter in self._waiters if not waiter.future.done()]
+        if not self._waiters and self._timer is not None:
+            # Nothing left to wake up
+            self._timer.cancel()
+            self._timer = None
+        while self._waiters and self._running < self._max_concurrent:
+            if self._tokens < 1:
+                if self._timer is None:
+                    delay = (1 - self._tokens) / self._rate
+                    self._timer = asyncio.get_running_loop().call_later(delay, self._on_timer)
+                return
+            waiter = min(self._waiters, key=lambda waiter: self._effective_priority(waiter, now))
+            self._waiters.remove(waiter)
+            self._tokens -= 1
+            self._running += 1
+            waiter.future.set_result(None)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._dispatch()
@@ -0,0 +1,65 @@
+"""Mapping of the task properties used by the integration to the database schema."""
+from __future__ import annotations
+
+from .const import (
+    TASK_STATUS_PROPERTY,
+    TASK_DATE_PROPERTY,
+    TASK_FROG_PROPERTY,
+    TASK_WEEKEND_PROPERTY,
+    TASK_10MIN_PROPERTY,
+    TASK_COMPLETED_PROPERTY,
+    TASK_PROJECT_PROPERTY,
+    TASK_DESCRIPTION_PROPERTY,
+    TASK_OMNIFOCUS_PROJECT_SYNC_PROPERTY,
+)
+
+ROLE_TITLE = "title"
+ROLE_STATUS = "status"
+ROLE_DUE = "due"
+ROLE_FROG = "frog"
+ROLE_WEEKEND = "weekend"
+ROLE_QUICK = "quick"
+ROLE_COMPLETED = "completed"
+ROLE_PROJECT = "project"
+ROLE_NOTES = "notes"
+ROLE_OMNIFOCUS_PROJECT = "omnifocus_project"
+
+# Property id of each role, the title property always has the id "title"
+PROPERTY_IDS = {
+    ROLE_TITLE: "title",
+    ROLE_STATUS: TASK_STATUS_PROPERTY,
+    ROLE_DUE: TASK_DATE_PROPERTY,
+    ROLE_FROG: TASK_FROG_PROPERTY,
+    ROLE_WEEKEND: TASK_WEEKEND_PROPERTY,
+    ROLE_QUICK: TASK_10MIN_PROPERTY,
+    ROLE_COMPLETED: TASK_COMPLETED_PROPERTY,
+    ROLE_PROJECT: TASK_PROJECT_PROPERTY,
+    ROLE_NOTES: TASK_DESCRIPTION_PROPERTY,
+    ROLE_OMNIFOCUS_PROJECT: TASK_OMNIFOCUS_PROJECT_SYNC_PROPERTY,
+}
+REQUIRED_ROLES = (ROLE_TITLE, ROLE_STATUS, ROLE_DUE)
+
+# Used until the schema was fetched: properties are looked up by id only
+DEFAULT_PROPERTY_MAP = {
+    role: {"id": prop_id, "name": None, "type": None}
+    for role, prop_id in PROPERTY_IDS.items()
+}
+
+
+def resolve_property_map(database: dict) -> dict[str, dict]:
+    """Map each role to the id, name and type of its property in the database.
+
+    Roles whose property does not exist in the database are left out.
+    """
+    by_id = {prop['id']: (name, prop['type']) for name, prop in database['properties'].items()}
+    property_map = {}
+    for role, prop_id in PROPERTY_IDS.items():
+        if prop_id in by_id:
+            name, prop_type = by_id[prop_id]
+            property_map[role] = {"id": prop_id, "name": name, "type": prop_type}
+    return property_map
+
+
+def missing_roles(property_map: dict[str, dict]) -> list[str]:
+    """Return the required roles without a property."""
+    return [role for role in REQUIRED_ROLES if role not in property_map]
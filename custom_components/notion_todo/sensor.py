@@ -0,0 +1,81 @@
+"""A sensor platform for Notion."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import date, datetime, timedelta
+
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .coordinator import NotionDataUpdateCoordinator
+from .task_index import FLAG_FROG, FLAG_QUICK, FLAG_WEEKEND, TaskCounts
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up the sensor platform config entry."""
+    coordinator: NotionDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    entities = [
+        NotionTaskCountSensor(coordinator, 'Notion Overdue Tasks',
+                              lambda counts, today: coordinator.overdue_count),
+        NotionTaskCountSensor(coordinator, 'Notion Tasks Due Today',
+                              lambda counts, today: counts.due_between(today, today)),
+        NotionTaskCountSensor(coordinator, 'Notion Tasks Due Next 7 Days',
+                              lambda counts, today: counts.due_between(today + timedelta(days=1), today + timedelta(days=7))),
+        NotionTaskCountSensor(coordinator, 'Notion Open Frog Tasks',
+                              lambda counts, today: counts.flagged(FLAG_FROG)),
+        NotionTaskCountSensor(coordinator, 'Notion Open Weekend Tasks',
+                              lambda counts, today: counts.flagged(FLAG_WEEKEND)),
+        NotionTaskCountSensor(coordinator, 'Notion Open Quick 10min Tasks',
+                              lambda counts, today: counts.flagged(FLAG_QUICK)),
+    ]
+    if coordinator.mirror is not None:
+        entities.append(NotionTaskCountSensor(coordinator, 'Notion Tasks Completed Last 7 Days',
+                                              lambda counts, today: coordinator.mirror.completed_last_7_days))
+
+    async_add_entities(entities)
+
+
+class NotionTaskCountSensor(CoordinatorEntity[NotionDataUpdateCoordinator], SensorEntity):
+    """Number of Notion tasks matching a criterion."""
+
+    _attr_native_unit_of_measurement = "tasks"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:checkbox-marked-circle-outline"
+
+    def __init__(
+        self,
+        coordinator: NotionDataUpdateCoordinator,
+        name: str,
+        value_fn: Callable[[TaskCounts, date], int],
+    ) -> None:
+        """Initialize SensorEntity."""
+        super().__init__(coordinator=coordinator)
+        self._attr_unique_id = f"{name.lower().replace(' ', '_')}_{coordinator.config_entry.entry_id}"
+        self._attr_name = name
+        self._value_fn = value_fn
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of tasks."""
+        return self._value_fn(self.coordinator.counts, dt_util.now().date())
+
+    async def async_added_to_hass(self) -> None:
+        """Refresh the day-relative counts at midnight."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_change(self.hass, self._handle_day_rollover, hour=0, minute=0, second=0)
+        )
+
+    @callback
+    def _handle_day_rollover(self, now: datetime) -> None:
+        """Handle the start of a new day."""
+        self.async_write_ha_state()
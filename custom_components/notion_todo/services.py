@@ -1,12 +1,26 @@
 """Services for Notion Todo integration."""
+import asyncio
 from datetime import datetime
 import logging
-from homeassistant.core import HomeAssistant, ServiceCall
+import time
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError
 import voluptuous as vol
 import homeassistant.helpers.config_validation as cv
 
+from .api import NotionApiClientError
 from .const import DOMAIN
 from .coordinator import NotionDataUpdateCoordinator
+from .dedupe import DEFAULT_DEDUPE_WINDOW, MAX_DEDUPE_WINDOW
+from .outbox import LOCAL_ID_PREFIX
+from .profiling import SORT_CUMULATIVE, SORT_KEYS, async_profile_refresh, summarize_profile
+from .schema import DEFAULT_PROPERTY_MAP
+from .task_index import FLAGS, decode_task
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,12 +32,13 @@ async def async_setup_services(hass: HomeAssistant) -> None:
     if hass.services.has_service(DOMAIN, "create_task"):
         return
 
-    async def create_task_service(call: ServiceCall) -> None:
+    async def create_task_service(call: ServiceCall) -> ServiceResponse:
         """Create a new task in Notion."""
         task_name = call.data.get("task_name")
         project = call.data.get("omnifocus_project", "Household")
         due_date_str = call.data.get("due_date")
         under_10_min = call.data.get("under_10_min", False)
+        dedupe_window = call.data.get("dedupe_window", DEFAULT_DEDUPE_WINDOW)
         
         # Parse due date if provided
         due_date = None
@@ -49,21 +64,38 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         # Get the first coordinator
         entries = hass.data[DOMAIN]
         if not entries:
-            return
+            return None
 
         coordinator: NotionDataUpdateCoordinator = next(iter(entries.values()))
 
-        # Create the task with correct status format
-        await coordinator.client.create_task(
+        async def create() -> str:
+            # Create the task with correct status format, queued if Notion is unreachable
+            page_id, _ = await coordinator.outbox.async_create_task(
+                title=task_name,
+                status="Not_started",
+                omnifocus_project=project,
+                due=due_date,
+                under_10_min=under_10_min
+            )
+            return page_id
+
+        # Unless the same task was created within the dedupe window
+        # (retries, double-fired triggers)
+        page_id, created = await coordinator.dedupe.async_create(
             title=task_name,
-            status="Not_started",
-            omnifocus_project=project,
             due=due_date,
-            under_10_min=under_10_min
+            project=project,
+            window=dedupe_window,
+            create=create,
         )
+        # Notion was unreachable, the task is queued under a local id
+        queued = page_id.startswith(LOCAL_ID_PREFIX)
 
         # Refresh data
-        await coordinator.async_refresh()
+        if created and not queued:
+            await coordinator.async_full_refresh()
+
+        return {"page_id": page_id, "created": created, "queued": queued}
 
     hass.services.async_register(
         DOMAIN,
@@ -74,5 +106,142 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             vol.Optional("omnifocus_project", default="Household"): cv.string,
             vol.Optional("due_date"): cv.string,
             vol.Optional("under_10_min", default=False): cv.boolean,
+            vol.Optional("dedupe_window", default=DEFAULT_DEDUPE_WINDOW): vol.All(
+                vol.Coerce(int), vol.Range(min=0, max=MAX_DEDUPE_WINDOW)
+            ),
+        }),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def search_tasks_service(call: ServiceCall) -> ServiceResponse:
+        """Search the synced tasks without calling the Notion API."""
+        entries = hass.data[DOMAIN]
+        if not entries:
+            return {"tasks": []}
+
+        coordinator: NotionDataUpdateCoordinator = next(iter(entries.values()))
+        tasks = coordinator.index.search(
+            text=call.data.get("text"),
+            project=call.data.get("project"),
+            status=call.data.get("status"),
+            flags=call.data.get("flags", []),
+            due_after=call.data.get("due_after"),
+            due_before=call.data.get("due_before"),
+            limit=call.data.get("limit"),
+        )
+        return {"tasks": [task.as_dict() for task in tasks]}
+
+    hass.services.async_register(
+        DOMAIN,
+        "search_tasks",
+        search_tasks_service,
+        schema=vol.Schema({
+            vol.Optional("text"): cv.string,
+            vol.Optional("project"): cv.string,
+            vol.Optional("status"): cv.string,
+            vol.Optional("flags", default=[]): vol.All(cv.ensure_list, [vol.In(FLAGS)]),
+            vol.Optional("due_after"): cv.date,
+            vol.Optional("due_before"): cv.date,
+            vol.Optional("limit"): cv.positive_int,
+        }),
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def get_task_details_service(call: ServiceCall) -> ServiceResponse:
+        """Fetch the notes and page body of a task on demand."""
+        entries = hass.data[DOMAIN]
+        if not entries:
+            return {}
+
+        coordinator: NotionDataUpdateCoordinator = next(iter(entries.values()))
+        task_id = call.data["task_id"]
+        if task_id.startswith(LOCAL_ID_PREFIX):
+            raise HomeAssistantError(f"Task {task_id} is queued and not in Notion yet")
+
+        try:
+            task = coordinator.index.tasks.get(task_id)
+            if task is None:
+                task = decode_task(
+                    await coordinator.client.async_get_page(task_id),
+                    coordinator.client.property_map or DEFAULT_PROPERTY_MAP,
+                )
+
+            body = await coordinator.contents.async_get(task.id, task.last_edited_time)
+        except NotionApiClientError as exception:
+            raise HomeAssistantError(f"Unable to fetch task {task_id}: {exception}") from exception
+        # Let the todo entities show the fetched body in the item description
+        coordinator.async_update_listeners()
+        return {
+            "uid": task.id,
+            "summary": task.title.strip(),
+            "notes": task.notes,
+            "body": body,
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        "get_task_details",
+        get_task_details_service,
+        schema=vol.Schema({
+            vol.Required("task_id"): cv.string,
+        }),
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    profile_lock = asyncio.Lock()
+
+    async def profile_refresh_service(call: ServiceCall) -> ServiceResponse:
+        """Profile one coordinator refresh and entity update cycle."""
+        entries = hass.data[DOMAIN]
+        if not entries:
+            return {}
+
+        coordinator: NotionDataUpdateCoordinator = next(iter(entries.values()))
+        # Only one profiler can be active at a time
+        async with profile_lock:
+            started = time.perf_counter()
+            profiler = await async_profile_refresh(coordinator)
+            duration = time.perf_counter() - started
+
+        path = hass.config.path(f"{DOMAIN}_profile_{int(time.time())}.prof")
+        functions = await hass.async_add_executor_job(
+            summarize_profile, profiler, path, call.data["sort"], call.data["top"]
+        )
+        _LOGGER.info("Wrote refresh profile to %s", path)
+        return {
+            "path": path,
+            "duration": round(duration, 6),
+            "functions": functions,
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        "profile_refresh",
+        profile_refresh_service,
+        schema=vol.Schema({
+            vol.Optional("top", default=20): cv.positive_int,
+            vol.Optional("sort", default=SORT_CUMULATIVE): vol.In(SORT_KEYS),
+        }),
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def task_history_service(call: ServiceCall) -> ServiceResponse:
+        """Answer history queries from the local task mirror."""
+        entries = hass.data[DOMAIN]
+        if not entries:
+            return {"weeks": []}
+
+        coordinator: NotionDataUpdateCoordinator = next(iter(entries.values()))
+        if coordinator.mirror is None:
+            raise HomeAssistantError("Enable the SQLite mirror in the integration options first")
+        return {"weeks": await coordinator.mirror.async_completed_per_week(call.data["weeks"])}
+
+    hass.services.async_register(
+        DOMAIN,
+        "task_history",
+        task_history_service,
+        schema=vol.Schema({
+            vol.Optional("weeks", default=8): vol.All(vol.Coerce(int), vol.Range(min=1, max=520)),
         }),
-    )
\ No newline at end of file
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,331 @@
+"""In-memory indexes over the decoded tasks of a Notion database."""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import date
+import re
+
+from .const import STATUS_ARCHIVED, STATUS_DONE
+from .notion_property_helper import NotionPropertyHelper as propHelper
+from .schema import (
+    DEFAULT_PROPERTY_MAP,
+    ROLE_COMPLETED,
+    ROLE_DUE,
+    ROLE_FROG,
+    ROLE_NOTES,
+    ROLE_OMNIFOCUS_PROJECT,
+    ROLE_PROJECT,
+    ROLE_QUICK,
+    ROLE_STATUS,
+    ROLE_TITLE,
+    ROLE_WEEKEND,
+)
+
+FLAG_FROG = ROLE_FROG
+FLAG_WEEKEND = ROLE_WEEKEND
+FLAG_QUICK = ROLE_QUICK
+FLAG_COMPLETED = ROLE_COMPLETED
+FLAGS = (FLAG_FROG, FLAG_WEEKEND, FLAG_QUICK, FLAG_COMPLETED)
+
+CLOSED_STATUSES = (STATUS_DONE, STATUS_ARCHIVED)
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str | None) -> set[str]:
+    """Split a text into case-folded word tokens.
+
+    Case folding (e.g. "ß" to "ss") matches dedupe.create_key, so titles
+    found by the index and idempotency keys agree.
+    """
+    if not text:
+        return set()
+    return set(_TOKEN_RE.findall(text.casefold()))
+
+
+def _normalize_key(value: str) -> str:
+    """Normalize a project id or name for index lookups."""
+    return value.strip().casefold().replace("-", "")
+
+
+@dataclass(frozen=True)
+class NotionTask:
+    """A decoded Notion task."""
+
+    id: str
+    title: str
+    status: str | None
+    due: str | None
+    project: tuple[str, ...] = ()
+    project_names: tuple[str, ...] = ()
+    flags: frozenset[str] = field(default_factory=frozenset)
+    last_edited_time: str | None = None
+    notes: str | None = None
+    omnifocus_project: str | None = None
+    created_time: str | None = None
+
+    @property
+    def is_open(self) -> bool:
+        """Return True if the task still needs action."""
+        return self.status not in CLOSED_STATUSES
+
+    @property
+    def due_date(self) -> str | None:
+        """Return the date part (YYYY-MM-DD) of the due date."""
+        return self.due[:10] if self.due else None
+
+    def as_dict(self) -> dict:
+        """Return a JSON serializable representation of the task."""
+        return {
+            "uid": self.id,
+            "summary": self.title.strip(),
+            "status": self.status,
+            "due": self.due,
+            "project": list(self.project_names or self.project),
+            "project_ids": list(self.project),
+            "notes": self.notes,
+            "omnifocus_project": self.omnifocus_project,
+            **{f"is_{flag}": flag in self.flags for flag in FLAGS},
+        }
+
+
+def decode_task(task: dict, property_map: dict[str, dict] = DEFAULT_PROPERTY_MAP) -> NotionTask:
+    """Decode a page of the database query into a NotionTask.
+
+    Properties missing from the page decode to None instead of failing.
+    """
+
+    def value(role):
+        prop = property_map.get(role)
+        if prop is None:
+            return None
+        return propHelper.get_property_by_name(prop['name'], prop['id'], task)
+
+    notes = value(ROLE_NOTES)
+    return NotionTask(
+        id=task['id'],
+        title=value(ROLE_TITLE) or '',
+        status=value(ROLE_STATUS),
+        due=value(ROLE_DUE),
+        project=tuple(value(ROLE_PROJECT) or ()),
+        flags=frozenset(flag for flag in FLAGS if value(flag)),
+        last_edited_time=task.get('last_edited_time'),
+        notes=(notes.strip() or None) if notes else None,
+        omnifocus_project=value(ROLE_OMNIFOCUS_PROJECT),
+        created_time=task.get('created_time'),
+    )
+
+
+def decode_tasks(data: dict, property_map: dict[str, dict] = DEFAULT_PROPERTY_MAP) -> list[NotionTask]:
+    """Decode the pages of one database query response.
+
+    async_get_data calls it for each response of a paginated query. Runs
+    in an executor thread for large responses, so it must not touch any
+    Home Assistant state.
+    """
+    return [decode_task(task, property_map) for task in data['results']]
+
+
+@dataclass
+class TaskChanges:
+    """Tasks that changed between two index updates."""
+
+    added: list[NotionTask] = field(default_factory=list)
+    updated: list[tuple[NotionTask, NotionTask]] = field(default_factory=list)
+    removed: list[NotionTask] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        """Return True if anything changed."""
+        return bool(self.added or self.updated or self.removed)
+
+
+class TaskIndex:
+    """Secondary indexes over the decoded tasks.
+
+    The indexes are maintained incrementally: only tasks that were added,
+    changed or removed since the last update are touched.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self.tasks: dict[str, NotionTask] = {}
+        self._by_project: dict[str, set[str]] = defaultdict(set)
+        self._by_status: dict[str, set[str]] = defaultdict(set)
+        self._by_flag: dict[str, set[str]] = {flag: set() for flag in FLAGS}
+        self._by_token: dict[str, set[str]] = defaultdict(set)
+        # (due date, task id) pairs, kept sorted for range queries
+        self._by_due: list[tuple[str, str]] = []
+        # sorted token list for prefix lookups, rebuilt lazily
+        self._tokens: list[str] | None = None
+
+    def __len__(self) -> int:
+        """Return the number of indexed tasks."""
+        return len(self.tasks)
+
+    def update(self, tasks: Iterable[NotionTask]) -> TaskChanges:
+        """Replace the indexed tasks and return what changed."""
+        changes = TaskChanges()
+        current = {task.id: task for task in tasks}
+        for task_id, task in list(self.tasks.items()):
+            if task_id not in current:
+                self._remove(task)
+                changes.removed.append(task)
+        for task_id, task in current.items():
+            old = self.tasks.get(task_id)
+            if old is None:
+                self._add(task)
+                changes.added.append(task)
+            elif old != task:
+                self._remove(old)
+                self._add(task)
+                changes.updated.append((old, task))
+        return changes
+
+    def _project_keys(self, task: NotionTask) -> set[str]:
+        return {_normalize_key(project) for project in (*task.project, *task.project_names)}
+
+    def _add(self, task: NotionTask) -> None:
+        self.tasks[task.id] = task
+        for key in self._project_keys(task):
+            self._by_project[key].add(task.id)
+        if task.status:
+            self._by_status[task.status.lower()].add(task.id)
+        for flag in task.flags:
+            self._by_flag[flag].add(task.id)
+        for token in tokenize(task.title):
+            if token not in self._by_token:
+                self._tokens = None
+            self._by_token[token].add(task.id)
+        if task.due_date:
+            insort(self._by_due, (task.due_date, task.id))
+
+    def _remove(self, task: NotionTask) -> None:
+        del self.tasks[task.id]
+        for key in self._project_keys(task):
+            self._discard(self._by_project, key, task.id)
+        if task.status:
+            self._discard(self._by_status, task.status.lower(), task.id)
+        for flag in task.flags:
+            self._by_flag[flag].discard(task.id)
+        for token in tokenize(task.title):
+            if self._discard(self._by_token, token, task.id):
+                self._tokens = None
+        if task.due_date:
+            pos = bisect_left(self._by_due, (task.due_date, task.id))
+            if pos < len(self._by_due) and self._by_due[pos] == (task.due_date, task.id):
+                del self._by_due[pos]
+
+    @staticmethod
+    def _discard(index: dict[str, set[str]], key: str, task_id: str) -> bool:
+        """Remove a task id from an index bucket, return True if the bucket is gone."""
+        bucket = index.get(key)
+        if bucket is None:
+            return False
+        bucket.discard(task_id)
+        if not bucket:
+            del index[key]
+            return True
+        return False
+
+    def _ids_for_token_prefix(self, prefix: str) -> set[str]:
+        if self._tokens is None:
+            self._tokens = sorted(self._by_token)
+        ids: set[str] = set()
+        pos = bisect_left(self._tokens, prefix)
+        while pos < len(self._tokens) and self._tokens[pos].startswith(prefix):
+            ids |= self._by_token[self._tokens[pos]]
+            pos += 1
+        return ids
+
+    def due_between(self, start: date | None, end: date | None) -> list[str]:
+        """Return the ids of tasks due within [start, end], ordered by due date."""
+        lo = bisect_left(self._by_due, (start.isoformat(), "")) if start else 0
+        hi = bisect_right(self._by_due, (end.isoformat(), "\uffff")) if end else len(self._by_due)
+        return [task_id for _, task_id in self._by_due[lo:hi]]
+
+    def search(
+        self,
+        text: str | None = None,
+        project: str | None = None,
+        status: str | None = None,
+        flags: Iterable[str] = (),
+        due_after: date | None = None,
+        due_before: date | None = None,
+        limit: int | None = None,
+    ) -> list[NotionTask]:
+        """Return the tasks matching all given criteria, ordered by due date."""
+        candidates: list[set[str]] = []
+        for token in tokenize(text):
+            candidates.append(self._ids_for_token_prefix(token))
+        if project:
+            candidates.append(self._by_project.get(_normalize_key(project), set()))
+        if status:
+            candidates.append(self._by_status.get(status.lower(), set()))
+        for flag in flags:
+            candidates.append(self._by_flag.get(flag, set()))
+
+        matches: set[str] | None = None
+        for ids in sorted(candidates, key=len):
+            matches = set(ids) if matches is None else matches & ids
+            if not matches:
+                return []
+
+        if due_after or due_before:
+            ordered = [
+                task_id for task_id in self.due_between(due_after, due_before)
+                if matches is None or task_id in matches
+            ]
+        else:
+            ordered = sorted(
+                self.tasks if matches is None else matches,
+                key=lambda task_id: (self.tasks[task_id].due_date or "\uffff", task_id),
+            )
+        if limit is not None:
+            ordered = ordered[:limit]
+        return [self.tasks[task_id] for task_id in ordered]
+
+
+class TaskCounts:
+    """Counts of open tasks per due date and per flag.
+
+    The counts are adjusted from the TaskChanges of each sync, day-relative
+    counts (overdue, today, ...) are summed over the distinct due dates.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty counts."""
+        self._by_due: Counter[str] = Counter()
+        self._by_flag: Counter[str] = Counter()
+
+    def apply(self, changes: TaskChanges) -> None:
+        """Adjust the counts by the changed tasks."""
+        for task in changes.removed:
+            self._count(task, -1)
+        for old, new in changes.updated:
+            self._count(old, -1)
+            self._count(new, 1)
+        for task in changes.added:
+            self._count(task, 1)
+
+    def _count(self, task: NotionTask, delta: int) -> None:
+        if not task.is_open:
+            return
+        if task.due_date:
+            self._by_due[task.due_date] += delta
+            if self._by_due[task.due_date] <= 0:
+                del self._by_due[task.due_date]
+        for flag in task.flags:
+            self._by_flag[flag] += delta
+
+    def due_between(self, start: date | None, end: date | None) -> int:
+        """Return the number of open tasks due within [start, end]."""
+        first = start.isoformat() if start else ""
+        last = end.isoformat() if end else "\uffff"
+        return sum(count for day, count in self._by_due.items() if first <= day <= last)
+
+    def flagged(self, flag: str) -> int:
+        """Return the number of open tasks with a flag."""
+        return self._by_flag[flag]
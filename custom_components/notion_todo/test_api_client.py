@@ -0,0 +1,175 @@
+"""Test cases for the Notion API client against a fake session."""
+import asyncio
+import unittest
+
+import aiohttp
+
+from custom_components.notion_todo import codec
+from custom_components.notion_todo.api import NotionApiClient, NotionApiClientError
+from custom_components.notion_todo.task_index import decode_tasks
+
+DATABASE_ID = "database"
+
+
+def page(number):
+    """Return a page of the task database."""
+    return {
+        'id': f"page-{number}",
+        'properties': {"Task name": {'id': "title", 'type': "title", 'title': [{'plain_text': f"Task {number}"}]}},
+    }
+
+
+class FakeResponse:
+    """A response of the fake session."""
+
+    def __init__(self, body, status=200):
+        """Initialize the response."""
+        self.status = status
+        self._body = codec.dumps(body)
+
+    def raise_for_status(self):
+        """Raise for error statuses."""
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(None, (), status=self.status)
+
+    async def read(self):
+        """Return the encoded body."""
+        return self._body
+
+
+class FakeSession:
+    """Serve database queries from a list of pages, 100 per request.
+
+    Other requests echo the requested id. GETs wait for the gate while it
+    is closed and fail with status while it is set.
+    """
+
+    def __init__(self, pages):
+        """Initialize the session."""
+        self.pages = pages
+        self.requests = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.status = 200
+
+    async def request(self, method, url, headers, data):
+        """Answer a request like the Notion API."""
+        body = codec.loads(data) if data else None
+        self.requests.append((method, url, body))
+        if method != "post":
+            if method == "get":
+                await self.gate.wait()
+            return FakeResponse({'id': url.rsplit("/", 1)[-1]}, self.status if method == "get" else 200)
+        start = int(body.get('start_cursor') or 0)
+        end = start + body.get('page_size', 100)
+        has_more = end < len(self.pages)
+        return FakeResponse({
+            'results': self.pages[start:end],
+            'has_more': has_more,
+            'next_cursor': str(end) if has_more else None,
+        })
+
+
+class TestNotionApiClient(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the Notion API client."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.session = FakeSession([page(number) for number in range(250)])
+        self.client = NotionApiClient("token", DATABASE_ID, self.session)
+
+    async def test_get_data_fetches_all_pages(self):
+        """Test that the task query follows next_cursor and parses every response."""
+        tasks = await self.client.async_get_data(parser=decode_tasks)
+
+        assert [task.id for task in tasks] == [f"page-{number}" for number in range(250)]
+        assert [body.get('start_cursor') for _, _, body in self.session.requests] == [None, "100", "200"]
+
+    async def test_get_data_without_parser_returns_one_response(self):
+        """Test that the raw pages of all responses are returned together."""
+        data = await self.client.async_get_data()
+
+        assert len(data['results']) == 250
+
+    async def test_overdue_count_pages_through_titles_only(self):
+        """Test that the overdue count follows next_cursor and skips the other properties."""
+        count = await self.client.async_get_overdue_count()
+
+        assert count == 250
+        assert len(self.session.requests) == 3
+        assert all(url.endswith("/query?filter_properties=title") for _, url, _ in self.session.requests)
+
+
+class TestSingleFlight(unittest.IsolatedAsyncioTestCase):
+    """Test cases for sharing identical reads in flight."""
+
+    def setUp(self):
+        """Set up the test environment with reads held in flight."""
+        self.session = FakeSession([])
+        self.session.gate.clear()
+        self.client = NotionApiClient("token", DATABASE_ID, self.session)
+
+    def gets(self):
+        """Return the number of GET requests sent."""
+        return sum(method == "get" for method, _, _ in self.session.requests)
+
+    async def test_identical_reads_share_one_request(self):
+        """Test that concurrent reads of the same page send one request."""
+        reads = [asyncio.create_task(self.client.async_get_page("page-1")) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        self.session.gate.set()
+
+        results = await asyncio.gather(*reads)
+
+        assert self.gets() == 1
+        assert results == [{'id': "page-1"}] * 3
+
+    async def test_different_reads_are_not_shared(self):
+        """Test that reads of different pages send a request each."""
+        reads = [asyncio.create_task(self.client.async_get_page(page_id)) for page_id in ("page-1", "page-2")]
+        await asyncio.sleep(0.01)
+        self.session.gate.set()
+
+        await asyncio.gather(*reads)
+
+        assert self.gets() == 2
+
+    async def test_cancelled_caller_does_not_cancel_the_others(self):
+        """Test that a caller giving up leaves the shared request to the others."""
+        first = asyncio.create_task(self.client.async_get_page("page-1"))
+        second = asyncio.create_task(self.client.async_get_page("page-1"))
+        await asyncio.sleep(0.01)
+
+        first.cancel()
+        self.session.gate.set()
+
+        assert await second == {'id': "page-1"}
+        assert first.cancelled()
+        assert self.gets() == 1
+
+    async def test_write_is_not_shared_with_earlier_reads(self):
+        """Test that a read after a write does not join a read that predates it."""
+        before = asyncio.create_task(self.client.async_get_page("page-1"))
+        await asyncio.sleep(0.01)
+
+        await self.client.delete_task("page-1")
+        after = asyncio.create_task(self.client.async_get_page("page-1"))
+        await asyncio.sleep(0.01)
+        self.session.gate.set()
+        await asyncio.gather(before, after)
+
+        assert self.gets() == 2
+
+    async def test_failed_read_is_shared_and_not_kept(self):
+        """Test that an error reaches every caller and the next read is sent again."""
+        self.session.status = 500
+        reads = [asyncio.create_task(self.client.async_get_page("page-1")) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        self.session.gate.set()
+
+        results = await asyncio.gather(*reads, return_exceptions=True)
+
+        assert all(isinstance(result, NotionApiClientError) for result in results)
+        self.session.status = 200
+        assert await self.client.async_get_page("page-1") == {'id': "page-1"}
+        assert self.gets() == 2
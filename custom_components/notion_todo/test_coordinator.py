@@ -0,0 +1,113 @@
+"""Test cases for the refresh decisions of the data update coordinator."""
+from datetime import datetime, timedelta, timezone
+import unittest
+from unittest.mock import patch
+
+from custom_components.notion_todo import coordinator as coordinator_module
+from custom_components.notion_todo.coordinator import NotionDataUpdateCoordinator
+
+NOW = datetime(2024, 1, 10, 12, 0, tzinfo=timezone.utc)
+INTERVAL = timedelta(minutes=30)
+LAST_FULL_REFRESH = NOW - timedelta(minutes=5)
+SYNCED_EDIT = "2024-01-10T11:50:00.000Z"
+
+
+def coordinator(**attributes):
+    """Return a coordinator with only the state the refresh decisions read."""
+    instance = NotionDataUpdateCoordinator.__new__(NotionDataUpdateCoordinator)
+    instance._full_refresh_interval = INTERVAL
+    instance._overdue_refreshed = None
+    for name, value in attributes.items():
+        setattr(instance, name, value)
+    return instance
+
+
+class TestUnchangedSinceSync(unittest.TestCase):
+    """Test cases for when the probe allows skipping the full query."""
+
+    def setUp(self):
+        """Freeze the time."""
+        for name in ("utcnow", "now"):
+            patcher = patch.object(coordinator_module.dt_util, name, return_value=NOW)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def synced(self, **attributes):
+        """Return a coordinator that did a full query five minutes ago."""
+        return coordinator(**{
+            'data': [],
+            '_force_full_refresh': False,
+            '_last_full_refresh': LAST_FULL_REFRESH,
+            '_synced_edit': SYNCED_EDIT,
+            **attributes,
+        })
+
+    def test_unchanged_skips(self):
+        """Test that the full query is skipped if the probe sees the synced edit."""
+        assert self.synced()._unchanged_since_sync(SYNCED_EDIT)
+
+    def test_first_refresh_queries(self):
+        """Test that there is always a full query without data."""
+        assert not self.synced(data=None)._unchanged_since_sync(SYNCED_EDIT)
+        assert not self.synced(_last_full_refresh=None)._unchanged_since_sync(SYNCED_EDIT)
+
+    def test_forced_refresh_queries(self):
+        """Test that a full refresh after a write is never skipped."""
+        assert not self.synced(_force_full_refresh=True)._unchanged_since_sync(SYNCED_EDIT)
+
+    def test_max_interval_queries(self):
+        """Test that changes the probe cannot see are picked up after the interval."""
+        instance = self.synced(_last_full_refresh=NOW - INTERVAL)
+
+        assert not instance._unchanged_since_sync(SYNCED_EDIT)
+
+    def test_date_change_queries(self):
+        """Test that the query filtering on today runs again on a new day."""
+        instance = self.synced(
+            _last_full_refresh=datetime(2024, 1, 9, 23, 59, tzinfo=timezone.utc),
+            _synced_edit="2024-01-09T23:50:00.000Z",
+        )
+        after_midnight = datetime(2024, 1, 10, 0, 1, tzinfo=timezone.utc)
+
+        with (
+            patch.object(coordinator_module.dt_util, "utcnow", return_value=after_midnight),
+            patch.object(coordinator_module.dt_util, "now", return_value=after_midnight),
+        ):
+            assert not instance._unchanged_since_sync("2024-01-09T23:50:00.000Z")
+
+    def test_new_edit_queries(self):
+        """Test that an edit since the full query is picked up."""
+        assert not self.synced()._unchanged_since_sync("2024-01-10T11:58:00.000Z")
+        assert not self.synced()._unchanged_since_sync(None)
+
+    def test_edit_in_the_minute_of_the_full_query_queries(self):
+        """Test that an edit with the same minute timestamp as the full query is not missed."""
+        instance = self.synced(_synced_edit="2024-01-10T11:55:00.000Z")
+
+        assert not instance._unchanged_since_sync("2024-01-10T11:55:00.000Z")
+
+
+class TestOverdueCountStale(unittest.TestCase):
+    """Test cases for when the overdue count is queried."""
+
+    def test_first_refresh_queries(self):
+        """Test that the count is queried on the first full refresh."""
+        assert coordinator()._overdue_count_stale(NOW)
+
+    def test_refresh_within_interval_skips(self):
+        """Test that full refreshes after writes reuse the count."""
+        instance = coordinator(_overdue_refreshed=NOW - INTERVAL + timedelta(seconds=1))
+
+        assert not instance._overdue_count_stale(NOW)
+
+    def test_refresh_after_interval_queries(self):
+        """Test that overdue tasks edited in Notion are picked up after the interval."""
+        instance = coordinator(_overdue_refreshed=NOW - INTERVAL)
+
+        assert instance._overdue_count_stale(NOW)
+
+    def test_date_change_queries(self):
+        """Test that the count is queried once tasks of yesterday became overdue."""
+        instance = coordinator(_overdue_refreshed=datetime(2024, 1, 9, 23, 59, tzinfo=timezone.utc))
+
+        assert instance._overdue_count_stale(datetime(2024, 1, 10, 0, 1, tzinfo=timezone.utc))
@@ -0,0 +1,107 @@
+"""Test cases for the create_task deduplicator."""
+import asyncio
+from datetime import datetime, timezone
+import unittest
+
+from custom_components.notion_todo.api import NotionApiClientError
+from custom_components.notion_todo.dedupe import CreateTaskDeduplicator
+from custom_components.notion_todo.task_index import NotionTask, TaskIndex
+
+TITLE = "Water the plants"
+DUE = "2024-01-01"
+PROJECT = "Household"
+
+
+class TestCreateTaskDeduplicator(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the create_task deduplicator."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.index = TaskIndex()
+        self.dedupe = CreateTaskDeduplicator(self.index)
+        self.calls = 0
+
+    async def __create(self, delay=0):
+        """Pretend to create a page and return its id."""
+        self.calls += 1
+        await asyncio.sleep(delay)
+        return f"page-{self.calls}"
+
+    async def test_concurrent_duplicates_create_one_page(self):
+        """Test that identical concurrent creates share one page."""
+        results = await asyncio.gather(*(
+            self.dedupe.async_create(title, DUE, PROJECT, 300, lambda: self.__create(0.01))
+            for title in (TITLE, f"  {TITLE.upper()} ")
+        ))
+
+        assert self.calls == 1
+        assert results == [("page-1", True), ("page-1", False)]
+
+    async def test_recent_duplicate_returns_existing_page(self):
+        """Test that a repeated create within the window returns the first page."""
+        await self.dedupe.async_create(TITLE, DUE, PROJECT, 300, self.__create)
+
+        result = await self.dedupe.async_create(TITLE, DUE, PROJECT, 300, self.__create)
+
+        assert self.calls == 1
+        assert result == ("page-1", False)
+
+    async def test_zero_window_always_creates(self):
+        """Test that a window of zero disables deduplication."""
+        await self.dedupe.async_create(TITLE, DUE, PROJECT, 0, self.__create)
+
+        result = await self.dedupe.async_create(TITLE, DUE, PROJECT, 0, self.__create)
+
+        assert result == ("page-2", True)
+
+    async def test_synced_task_is_a_duplicate(self):
+        """Test that a task created recently according to the synced tasks is found."""
+        created = datetime.now(timezone.utc).isoformat()
+        self.index.update([
+            NotionTask("synced", TITLE, "Not_started", DUE, omnifocus_project=PROJECT, created_time=created)
+        ])
+
+        result = await self.dedupe.async_create(TITLE, DUE, PROJECT, 300, self.__create)
+
+        assert self.calls == 0
+        assert result == ("synced", False)
+
+    async def test_synced_task_is_found_by_case_folded_title(self):
+        """Test that titles differing only under case folding are duplicates."""
+        created = datetime.now(timezone.utc).isoformat()
+        self.index.update([
+            NotionTask("synced", "Straße fegen", "Not_started", DUE, omnifocus_project=PROJECT, created_time=created)
+        ])
+
+        result = await self.dedupe.async_create("STRASSE fegen", DUE, PROJECT, 300, self.__create)
+
+        assert self.calls == 0
+        assert result == ("synced", False)
+
+    async def test_failed_create_is_not_remembered(self):
+        """Test that a create is retried after the first attempt failed."""
+        async def fail():
+            raise NotionApiClientError("down")
+
+        with self.assertRaises(NotionApiClientError):
+            await self.dedupe.async_create(TITLE, DUE, PROJECT, 300, fail)
+
+        result = await self.dedupe.async_create(TITLE, DUE, PROJECT, 300, self.__create)
+
+        assert result == ("page-1", True)
+
+    async def test_cancelled_create_releases_waiting_duplicates(self):
+        """Test that duplicates waiting for a cancelled create do not hang."""
+        first = asyncio.create_task(
+            self.dedupe.async_create(TITLE, DUE, PROJECT, 300, lambda: self.__create(10))
+        )
+        await asyncio.sleep(0)
+        duplicate = asyncio.create_task(
+            self.dedupe.async_create(TITLE, DUE, PROJECT, 300, self.__create)
+        )
+        await asyncio.sleep(0)
+
+        first.cancel()
+
+        with self.assertRaises(NotionApiClientError):
+            await asyncio.wait_for(duplicate, 1)
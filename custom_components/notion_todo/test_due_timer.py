@@ -0,0 +1,147 @@
+"""Test cases for the due time events."""
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+import unittest
+from unittest.mock import MagicMock, patch
+
+from custom_components.notion_todo import due_timer
+from custom_components.notion_todo.const import EVENT_TASK_DUE, STATUS_DONE, STATUS_NOT_STARTED
+from custom_components.notion_todo.due_timer import COMPACT_THRESHOLD, DueTimer
+from custom_components.notion_todo.task_index import NotionTask, TaskChanges
+
+NOW = datetime(2024, 1, 10, 12, 0, tzinfo=timezone.utc)
+LEAD = timedelta(minutes=15)
+
+TAXES = NotionTask("taxes", "File the taxes", STATUS_NOT_STARTED, "2024-01-10T14:00:00.000+00:00")
+DENTIST = NotionTask("dentist", "Dentist", STATUS_NOT_STARTED, "2024-01-10T13:00:00.000+00:00")
+
+
+def at(hour, minute=0):
+    """Return a time on the day of NOW."""
+    return NOW.replace(hour=hour, minute=minute)
+
+
+class TestDueTimer(unittest.TestCase):
+    """Test cases for the due time events."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        # A new unsubscribe callback for every armed timer
+        self.track = MagicMock(side_effect=lambda hass, action, point: MagicMock())
+        for patcher in (
+            patch.object(due_timer, "async_track_point_in_utc_time", self.track),
+            patch.object(due_timer.dt_util, "utcnow", return_value=NOW),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.hass = MagicMock()
+        self.timer = DueTimer(self.hass, "entry", LEAD)
+
+    def last_point(self):
+        """Return the time the timer was last armed for."""
+        return self.track.call_args.args[2]
+
+    def fire(self, now):
+        """Run the timer callback as Home Assistant would."""
+        self.track.call_args.args[1](now)
+
+    def fired(self):
+        """Return the data of the fired due events."""
+        return [
+            call.args[1] for call in self.hass.bus.async_fire.call_args_list
+            if call.args[0] == EVENT_TASK_DUE
+        ]
+
+    def test_only_open_timed_tasks_are_scheduled(self):
+        """Test that tasks with a due date only, closed or past tasks are skipped."""
+        self.timer.apply(TaskChanges(added=[
+            replace(TAXES, id="date", due="2024-01-11"),
+            replace(TAXES, id="done", status=STATUS_DONE),
+            replace(TAXES, id="past", due="2024-01-10T11:00:00.000+00:00"),
+        ]))
+
+        self.track.assert_not_called()
+
+    def test_timer_is_armed_for_the_earliest_task_minus_lead(self):
+        """Test that one timer is armed for the earliest task, earlier by the lead time."""
+        self.timer.apply(TaskChanges(added=[TAXES, DENTIST]))
+
+        assert self.track.call_count == 1
+        assert self.last_point() == at(12, 45)
+
+    def test_earlier_task_rearms(self):
+        """Test that a task due before the armed one replaces the timer."""
+        self.timer.apply(TaskChanges(added=[TAXES]))
+        unsub = self.timer._unsub
+
+        self.timer.apply(TaskChanges(added=[DENTIST]))
+
+        unsub.assert_called_once()
+        assert self.last_point() == at(12, 45)
+
+    def test_moved_task_is_invalidated_lazily(self):
+        """Test that a task moved to a later time no longer fires at the old time."""
+        self.timer.apply(TaskChanges(added=[TAXES, DENTIST]))
+        moved = replace(DENTIST, due="2024-01-10T15:00:00.000+00:00")
+
+        self.timer.apply(TaskChanges(updated=[(DENTIST, moved)]))
+
+        assert self.last_point() == at(13, 45)
+        self.fire(at(13, 45))
+        assert [event["uid"] for event in self.fired()] == ["taxes"]
+        assert self.last_point() == at(14, 45)
+
+    def test_removed_task_disarms(self):
+        """Test that removing the only scheduled task cancels the timer."""
+        self.timer.apply(TaskChanges(added=[DENTIST]))
+        unsub = self.timer._unsub
+
+        self.timer.apply(TaskChanges(removed=[DENTIST]))
+
+        unsub.assert_called_once()
+        assert self.timer._unsub is None
+
+    def test_completed_task_does_not_fire(self):
+        """Test that a task completed before its due time is dropped."""
+        self.timer.apply(TaskChanges(added=[TAXES, DENTIST]))
+
+        self.timer.apply(TaskChanges(updated=[(DENTIST, replace(DENTIST, status=STATUS_DONE))]))
+
+        assert self.last_point() == at(13, 45)
+
+    def test_timer_fires_due_tasks_and_rearms(self):
+        """Test that the events carry the task data and the next task is armed."""
+        self.timer.apply(TaskChanges(added=[TAXES, DENTIST]))
+
+        self.fire(at(12, 45))
+
+        assert self.fired() == [{
+            "entry_id": "entry",
+            "uid": "dentist",
+            "summary": "Dentist",
+            "due": DENTIST.due,
+            "lead_minutes": 15,
+        }]
+        assert self.last_point() == at(13, 45)
+
+    def test_same_time_update_refreshes_the_event_data(self):
+        """Test that a renamed task keeps its timer and fires with the new title."""
+        self.timer.apply(TaskChanges(added=[DENTIST]))
+        renamed = replace(DENTIST, title="Dentist appointment")
+
+        self.timer.apply(TaskChanges(updated=[(DENTIST, renamed)]))
+        self.fire(at(12, 45))
+
+        assert self.track.call_count == 1
+        assert [event["summary"] for event in self.fired()] == ["Dentist appointment"]
+
+    def test_heap_is_compacted(self):
+        """Test that stale entries of a task moved many times are dropped."""
+        task = DENTIST
+        self.timer.apply(TaskChanges(added=[task]))
+        for minute in range(1, 3 * COMPACT_THRESHOLD):
+            moved = replace(task, due=(at(13) + timedelta(minutes=minute)).isoformat())
+            self.timer.apply(TaskChanges(updated=[(task, moved)]))
+            task = moved
+
+        assert len(self.timer._heap) <= 2 + COMPACT_THRESHOLD + 1
@@ -0,0 +1,316 @@
+"""Test cases for the write outbox."""
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import aiohttp
+
+from custom_components.notion_todo import outbox
+from custom_components.notion_todo.api import (
+    NotionApiClientCommunicationError,
+    NotionApiClientError,
+)
+from custom_components.notion_todo.const import EVENT_WRITE_DROPPED
+from custom_components.notion_todo.outbox import (
+    LOCAL_ID_PREFIX,
+    REASON_CONFLICT,
+    REASON_REJECTED,
+    WriteOutbox,
+    is_transient,
+)
+from custom_components.notion_todo.task_index import NotionTask, TaskIndex
+
+PAGE_ID = "page-1"
+OTHER_PAGE_ID = "page-2"
+EDITED = "2024-01-01T10:00:00.000Z"
+
+
+def communication_error(cause=None):
+    """Return a communication error as raised by the API client."""
+    exception = NotionApiClientCommunicationError("Error fetching information")
+    exception.__cause__ = cause
+    return exception
+
+
+def response_error(status):
+    """Return a communication error caused by an HTTP error status."""
+    return communication_error(aiohttp.ClientResponseError(None, (), status=status))
+
+
+class FakeClient:
+    """Record the writes sent to Notion, failing with error while it is set."""
+
+    def __init__(self):
+        """Initialize the client."""
+        self.error = None
+        self.sent = []
+        self.edited = {PAGE_ID: EDITED, OTHER_PAGE_ID: EDITED}
+
+    async def create_task(self, title, status, priority=None, **kwargs):
+        """Pretend to create a page."""
+        self.__send("create", title)
+        page_id = f"created-{len(self.sent)}"
+        self.edited[page_id] = EDITED
+        return {'id': page_id}
+
+    async def update_task(self, task_id, title, priority=None, **kwargs):
+        """Pretend to update a page and return its new edit time."""
+        self.__send("update", title)
+        self.edited[task_id] = f"{self.edited[task_id]}+"
+        return {'id': task_id, 'last_edited_time': self.edited[task_id]}
+
+    async def delete_task(self, task_id, priority=None):
+        """Pretend to delete a page."""
+        self.__send("delete", task_id)
+        return {'id': task_id}
+
+    async def async_get_page(self, page_id, priority=None):
+        """Return the current edit time of a page."""
+        if self.error is not None:
+            raise self.error
+        return {'id': page_id, 'last_edited_time': self.edited[page_id]}
+
+    def __send(self, op, what):
+        if self.error is not None:
+            raise self.error
+        self.sent.append((op, what))
+
+
+class TestIsTransient(unittest.TestCase):
+    """Test cases for telling transient from rejected errors."""
+
+    def test_connection_errors_are_transient(self):
+        """Test that no connection, timeouts, 429 and 5xx can be retried."""
+        assert is_transient(communication_error())
+        assert is_transient(communication_error(asyncio.TimeoutError()))
+        assert is_transient(response_error(429))
+        assert is_transient(response_error(500))
+        assert is_transient(response_error(503))
+
+    def test_rejected_requests_are_not_transient(self):
+        """Test that requests Notion refused are not retried."""
+        assert not is_transient(response_error(400))
+        assert not is_transient(response_error(404))
+        assert not is_transient(NotionApiClientError("Something really wrong happened!"))
+
+
+class TestWriteOutbox(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the write outbox."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.client = FakeClient()
+        self.coordinator = MagicMock()
+        self.coordinator.client = self.client
+        self.coordinator.index = TaskIndex()
+        self.coordinator.index.update([
+            NotionTask(PAGE_ID, "Water the plants", "Not_started", None, last_edited_time=EDITED),
+            NotionTask(OTHER_PAGE_ID, "Feed the cat", "Not_started", None, last_edited_time=EDITED),
+        ])
+        self.coordinator.async_full_refresh = AsyncMock()
+        synced = list(self.coordinator.index.tasks.values())
+        self.coordinator.async_apply_outbox.side_effect = (
+            lambda: self.coordinator.index.update(self.outbox.overlay(synced))
+        )
+        self.hass = MagicMock()
+        self.background = []
+        self.hass.async_create_task = self.background.append
+
+        for target, value in (
+            ("Store", MagicMock(return_value=MagicMock(async_save=AsyncMock()))),
+            ("async_call_later", MagicMock()),
+            ("REPLAY_BATCH_INTERVAL", 0),
+        ):
+            patcher = patch.object(outbox, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.outbox = WriteOutbox(self.hass, self.coordinator, "entry")
+
+    def tearDown(self):
+        """Close the replays scheduled in the background, the tests replay explicitly."""
+        for coroutine in self.background:
+            coroutine.close()
+
+    async def __update(self, task_id, title):
+        return await self.outbox.async_update_task(task_id, title=title, status="Not_started", due=None, description="")
+
+    def __dropped(self):
+        return [
+            call.args[1] for call in self.hass.bus.async_fire.call_args_list
+            if call.args[0] == EVENT_WRITE_DROPPED
+        ]
+
+    async def test_write_is_sent_while_notion_is_reachable(self):
+        """Test that nothing is queued while Notion is reachable."""
+        assert await self.__update(PAGE_ID, "Water the roses")
+
+        assert self.client.sent == [("update", "Water the roses")]
+        assert self.outbox.pending == 0
+
+    async def test_write_is_queued_on_a_transient_error(self):
+        """Test that a write failing on a connection error is queued and shown."""
+        self.client.error = communication_error()
+
+        assert not await self.__update(PAGE_ID, "Water the roses")
+
+        assert self.outbox.pending == 1
+        overlay = {task.id: task.title for task in self.outbox.overlay(list(self.coordinator.index.tasks.values()))}
+        assert overlay[PAGE_ID] == "Water the roses"
+        self.coordinator.async_apply_outbox.assert_called()
+
+    async def test_rejected_write_is_raised(self):
+        """Test that a write Notion refused is raised, not queued."""
+        self.client.error = response_error(400)
+
+        with self.assertRaises(NotionApiClientError):
+            await self.__update(PAGE_ID, "Water the roses")
+
+        assert self.outbox.pending == 0
+
+    async def test_writes_queue_behind_pending_ones(self):
+        """Test that writes made while others are queued are replayed in order."""
+        self.client.error = communication_error()
+        await self.__update(PAGE_ID, "Water the roses")
+        self.client.error = None
+
+        assert not await self.__update(OTHER_PAGE_ID, "Feed the dog")
+        assert self.client.sent == []
+        assert len(self.background) == 1
+
+        await self.outbox.async_replay()
+
+        assert self.client.sent == [("update", "Water the roses"), ("update", "Feed the dog")]
+        assert self.outbox.pending == 0
+        self.coordinator.async_full_refresh.assert_awaited_once()
+
+    async def test_update_is_folded_into_queued_create(self):
+        """Test that updating a queued task changes the queued create."""
+        self.client.error = communication_error()
+        task_id, sent = await self.outbox.async_create_task(title="Buy milk", status="Not_started")
+        assert task_id.startswith(LOCAL_ID_PREFIX)
+        assert not sent
+
+        assert not await self.__update(task_id, "Buy oat milk")
+        assert self.outbox.pending == 1
+
+        self.client.error = None
+        await self.outbox.async_replay()
+
+        assert self.client.sent == [("create", "Buy oat milk")]
+
+    async def test_delete_of_queued_create_drops_it(self):
+        """Test that deleting a queued task removes the queued create."""
+        self.client.error = communication_error()
+        task_id, _ = await self.outbox.async_create_task(title="Buy milk", status="Not_started")
+
+        assert not await self.outbox.async_delete_task(task_id)
+
+        assert self.outbox.pending == 0
+        assert self.client.sent == []
+
+    async def test_conflicting_write_is_dropped(self):
+        """Test that a queued update of a page edited in Notion meanwhile is dropped."""
+        self.client.error = communication_error()
+        await self.__update(PAGE_ID, "Water the roses")
+        self.client.error = None
+        self.client.edited[PAGE_ID] = "2024-01-01T11:00:00.000Z"
+
+        await self.outbox.async_replay()
+
+        assert self.client.sent == []
+        assert self.outbox.pending == 0
+        [dropped] = self.__dropped()
+        assert dropped['reason'] == REASON_CONFLICT
+        assert dropped['uid'] == PAGE_ID
+        assert dropped['base_edited'] == EDITED
+        assert dropped['remote_edited'] == "2024-01-01T11:00:00.000Z"
+
+    async def test_later_writes_of_a_page_are_rebased(self):
+        """Test that the own update of a page is not a conflict for the next queued one."""
+        self.client.error = communication_error()
+        await self.__update(PAGE_ID, "Water the roses")
+        await self.__update(PAGE_ID, "Water the tulips")
+        self.client.error = None
+
+        await self.outbox.async_replay()
+
+        assert self.client.sent == [("update", "Water the roses"), ("update", "Water the tulips")]
+        assert self.__dropped() == []
+
+    async def test_replay_stops_at_a_transient_error(self):
+        """Test that writes stay queued while Notion is still unreachable."""
+        self.client.error = communication_error()
+        await self.__update(PAGE_ID, "Water the roses")
+        await self.__update(OTHER_PAGE_ID, "Feed the dog")
+
+        await self.outbox.async_replay()
+
+        assert self.outbox.pending == 2
+        assert self.__dropped() == []
+        self.coordinator.async_full_refresh.assert_not_awaited()
+
+    async def test_rejected_write_is_dropped_on_replay(self):
+        """Test that a queued write Notion refused is dropped and the rest is sent."""
+        self.client.error = communication_error()
+        await self.__update(PAGE_ID, "Water the roses")
+        await self.__update(OTHER_PAGE_ID, "Feed the dog")
+        self.client.error = None
+        get_page = self.client.async_get_page
+
+        async def get_deleted_page(page_id, priority=None):
+            if page_id == PAGE_ID:
+                raise response_error(404)
+            return await get_page(page_id, priority)
+
+        with patch.object(self.client, "async_get_page", get_deleted_page):
+            await self.outbox.async_replay()
+
+        assert self.client.sent == [("update", "Feed the dog")]
+        assert self.outbox.pending == 0
+        [dropped] = self.__dropped()
+        assert dropped['reason'] == REASON_REJECTED
+        assert dropped['uid'] == PAGE_ID
+
+    async def test_write_of_replayed_create_goes_to_created_page(self):
+        """Test that a write of a replayed task before the next sync is not lost."""
+        self.client.error = communication_error()
+        task_id, _ = await self.outbox.async_create_task(title="Buy milk", status="Not_started")
+        self.client.error = None
+        await self.outbox.async_replay()
+
+        assert await self.__update(task_id, "Buy oat milk")
+
+        assert self.client.sent == [("create", "Buy milk"), ("update", "Buy oat milk")]
+        assert self.client.edited["created-1"] != EDITED
+
+    async def test_write_during_create_is_sent_after_it(self):
+        """Test that a write of a task whose create is being sent reaches the created page."""
+        self.client.error = communication_error()
+        task_id, _ = await self.outbox.async_create_task(title="Buy milk", status="Not_started")
+        self.client.error = None
+        create_task = self.client.create_task
+
+        async def create_and_edit(**kwargs):
+            page = await create_task(**kwargs)
+            assert not await self.__update(task_id, "Buy oat milk")
+            return page
+
+        with patch.object(self.client, "create_task", create_and_edit):
+            await self.outbox.async_replay()
+
+        assert self.client.sent == [("create", "Buy milk"), ("update", "Buy oat milk")]
+        assert self.client.edited["created-1"] != EDITED
+        assert self.outbox.pending == 0
+
+    async def test_write_of_synced_local_id_is_rejected(self):
+        """Test that a local id the entities no longer show is not silently dropped."""
+        self.client.error = communication_error()
+        task_id, _ = await self.outbox.async_create_task(title="Buy milk", status="Not_started")
+        self.client.error = None
+        self.coordinator.async_full_refresh.side_effect = (
+            lambda: self.coordinator.index.update(self.outbox.overlay([]))
+        )
+        await self.outbox.async_replay()
+
+        with self.assertRaises(NotionApiClientError):
+            await self.__update(task_id, "Buy oat milk")
@@ -0,0 +1,42 @@
+"""Test cases for the refresh profiling."""
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.notion_todo import profiling
+from custom_components.notion_todo.profiling import async_profile_refresh
+
+THRESHOLD = 64 * 1024
+
+
+class TestProfileRefresh(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the refresh profiling."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.coordinator = MagicMock(async_full_refresh=AsyncMock())
+        self.coordinator.client.executor_decode_threshold = THRESHOLD
+
+    async def test_refresh_is_profiled(self):
+        """Test that the refresh runs under the profiler with inline decoding."""
+        async def refresh():
+            assert self.coordinator.client.executor_decode_threshold > THRESHOLD
+
+        self.coordinator.async_full_refresh.side_effect = refresh
+
+        profiler = await async_profile_refresh(self.coordinator)
+
+        assert profiler.getstats()
+        assert self.coordinator.client.executor_decode_threshold == THRESHOLD
+
+    async def test_active_profiler_raises(self):
+        """Test that another active profiler is reported as a service error."""
+        profile = MagicMock()
+        profile.return_value.enable.side_effect = ValueError("Another profiling tool is already active")
+
+        with patch.object(profiling.cProfile, "Profile", profile), self.assertRaises(HomeAssistantError):
+            await async_profile_refresh(self.coordinator)
+
+        self.coordinator.async_full_refresh.assert_not_awaited()
+        assert self.coordinator.client.executor_decode_threshold == THRESHOLD
@@ -0,0 +1,63 @@
+"""Test cases for the relation title cache."""
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import aiohttp
+
+from custom_components.notion_todo import relation_cache
+from custom_components.notion_todo.api import NotionApiClientCommunicationError
+from custom_components.notion_todo.relation_cache import RelationTitleCache
+
+PROJECT_ID = "project-1"
+PROJECT_PAGE = {
+    'id': PROJECT_ID,
+    'properties': {"Name": {'id': "title", 'type': "title", 'title': [{'plain_text': "Garden"}]}},
+}
+
+
+def response_error(status):
+    """Return a communication error caused by an HTTP error status."""
+    exception = NotionApiClientCommunicationError("Error fetching information")
+    exception.__cause__ = aiohttp.ClientResponseError(None, (), status=status)
+    return exception
+
+
+class TestRelationTitleCache(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the relation title cache."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        store = MagicMock(async_load=AsyncMock(return_value=None))
+        patcher = patch.object(relation_cache, "Store", MagicMock(return_value=store))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = MagicMock(async_get_page=AsyncMock(return_value=PROJECT_PAGE))
+        self.cache = RelationTitleCache(MagicMock(), self.client, "entry")
+
+    async def test_title_is_fetched_once(self):
+        """Test that a resolved title costs no further request."""
+        await self.cache.async_resolve([PROJECT_ID])
+        await self.cache.async_resolve([PROJECT_ID])
+
+        assert self.cache.title(PROJECT_ID) == "Garden"
+        assert self.client.async_get_page.await_count == 1
+
+    async def test_transient_error_is_retried(self):
+        """Test that a timeout, 429 or 5xx is retried on the next resolve."""
+        self.client.async_get_page.side_effect = [response_error(503), PROJECT_PAGE]
+
+        await self.cache.async_resolve([PROJECT_ID])
+        assert self.cache.title(PROJECT_ID) == PROJECT_ID
+
+        await self.cache.async_resolve([PROJECT_ID])
+        assert self.cache.title(PROJECT_ID) == "Garden"
+
+    async def test_permanent_error_is_cached(self):
+        """Test that a page that is not shared is not fetched again within the TTL."""
+        self.client.async_get_page.side_effect = response_error(404)
+
+        await self.cache.async_resolve([PROJECT_ID])
+        await self.cache.async_resolve([PROJECT_ID])
+
+        assert self.cache.title(PROJECT_ID) == PROJECT_ID
+        assert self.client.async_get_page.await_count == 1
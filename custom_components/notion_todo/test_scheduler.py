@@ -0,0 +1,116 @@
+"""Test cases for the request scheduler."""
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from custom_components.notion_todo import scheduler
+from custom_components.notion_todo.scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_SERVICE,
+    RequestScheduler,
+)
+
+
+class TestRequestScheduler(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the request scheduler."""
+
+    async def __hold(self, requests, started, release, priority, name):
+        """Take a slot, record the order and hold it until release is set."""
+        async with requests.slot(priority):
+            started.append(name)
+            await release.wait()
+
+    async def test_request_after_burst_waits_for_refill(self):
+        """Test that a request beyond the burst is served once a token is refilled."""
+        requests = RequestScheduler(rate=50, burst=1)
+        async with requests.slot(PRIORITY_SERVICE):
+            pass
+
+        async def second():
+            async with requests.slot(PRIORITY_SERVICE):
+                pass
+
+        await asyncio.wait_for(second(), 1)
+
+        assert requests._timer is None
+
+    async def test_waiters_are_served_by_priority(self):
+        """Test that waiting requests are served most urgent first."""
+        requests = RequestScheduler(rate=1000, burst=10, max_concurrent=1)
+        started, release = [], asyncio.Event()
+        holder = asyncio.create_task(self.__hold(requests, started, release, PRIORITY_SERVICE, "holder"))
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(self.__hold(requests, started, release, priority, name))
+            for priority, name in (
+                (PRIORITY_BACKGROUND, "background"),
+                (PRIORITY_SERVICE, "service"),
+                (PRIORITY_INTERACTIVE, "interactive"),
+            )
+        ]
+        await asyncio.sleep(0)
+
+        release.set()
+        await asyncio.gather(holder, *waiters)
+
+        assert started == ["holder", "interactive", "service", "background"]
+
+    async def test_waiting_request_ages_into_a_higher_class(self):
+        """Test that a long waiting background request is not starved."""
+        requests = RequestScheduler(rate=1000, burst=10, max_concurrent=1)
+        started, release = [], asyncio.Event()
+        with patch.object(scheduler, "AGING_SECONDS", 0.01):
+            holder = asyncio.create_task(self.__hold(requests, started, release, PRIORITY_SERVICE, "holder"))
+            await asyncio.sleep(0)
+            background = asyncio.create_task(
+                self.__hold(requests, started, release, PRIORITY_BACKGROUND, "background")
+            )
+            await asyncio.sleep(0.1)
+            interactive = asyncio.create_task(
+                self.__hold(requests, started, release, PRIORITY_INTERACTIVE, "interactive")
+            )
+            await asyncio.sleep(0)
+
+            release.set()
+            await asyncio.gather(holder, background, interactive)
+
+        assert started == ["holder", "background", "interactive"]
+
+    async def test_cancelled_waiter_does_not_block_others(self):
+        """Test that a cancelled waiter gives up its place and its slot."""
+        requests = RequestScheduler(rate=1000, burst=10, max_concurrent=1)
+        started, release = [], asyncio.Event()
+        holder = asyncio.create_task(self.__hold(requests, started, release, PRIORITY_SERVICE, "holder"))
+        await asyncio.sleep(0)
+        cancelled = asyncio.create_task(self.__hold(requests, started, release, PRIORITY_INTERACTIVE, "cancelled"))
+        waiting = asyncio.create_task(self.__hold(requests, started, release, PRIORITY_SERVICE, "waiting"))
+        await asyncio.sleep(0)
+
+        cancelled.cancel()
+        release.set()
+        await asyncio.gather(holder, waiting)
+
+        assert started == ["holder", "waiting"]
+        assert requests._running == 0
+
+    async def test_timer_is_dropped_when_no_waiter_remains(self):
+        """Test that cancelling the last waiter cancels the refill timer."""
+        requests = RequestScheduler(rate=0.1, burst=1)
+        async with requests.slot(PRIORITY_SERVICE):
+            pass
+
+        async def second():
+            async with requests.slot(PRIORITY_SERVICE):
+                pass
+
+        waiting = asyncio.create_task(second())
+        await asyncio.sleep(0)
+        assert requests._timer is not None
+
+        waiting.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiting
+
+        assert requests._timer is None
+        assert not requests._waiters
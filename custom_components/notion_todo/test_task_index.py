@@ -0,0 +1,144 @@
+"""Test cases for the task index."""
+from dataclasses import replace
+from datetime import date
+import unittest
+
+from custom_components.notion_todo.const import (
+    STATUS_DONE,
+    STATUS_NOT_STARTED,
+    TASK_DATE_PROPERTY,
+    TASK_FROG_PROPERTY,
+    TASK_STATUS_PROPERTY,
+)
+from custom_components.notion_todo.task_index import (
+    FLAG_FROG,
+    FLAG_QUICK,
+    NotionTask,
+    TaskChanges,
+    TaskCounts,
+    TaskIndex,
+    decode_task,
+)
+
+HOUSEHOLD = "1f2e3d4c-0000-0000-0000-000000000001"
+GARDEN = "1f2e3d4c-0000-0000-0000-000000000002"
+
+PLANTS = NotionTask(
+    "plants", "Water the plants", STATUS_NOT_STARTED, "2024-01-02",
+    project=(GARDEN,), project_names=("Garden",), flags=frozenset({FLAG_QUICK}),
+)
+TAXES = NotionTask("taxes", "File the taxes", STATUS_NOT_STARTED, "2024-01-10T09:00:00+00:00", flags=frozenset({FLAG_FROG}))
+DISHES = NotionTask("dishes", "Do the dishes", STATUS_DONE, "2024-01-01", project=(HOUSEHOLD,))
+PLANTER = NotionTask("planter", "Buy a planter", STATUS_NOT_STARTED, None, project=(GARDEN,))
+
+
+def ids(tasks):
+    """Return the ids of tasks."""
+    return [task.id for task in tasks]
+
+
+class TestTaskIndex(unittest.TestCase):
+    """Test cases for the task index."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.index = TaskIndex()
+        self.index.update([PLANTS, TAXES, DISHES, PLANTER])
+
+    def test_update_returns_changes(self):
+        """Test that an update reports added, updated and removed tasks."""
+        done = replace(PLANTS, status=STATUS_DONE)
+        new = NotionTask("new", "Call mom", STATUS_NOT_STARTED, None)
+
+        changes = self.index.update([done, TAXES, DISHES, new])
+
+        assert ids(changes.added) == ["new"]
+        assert changes.updated == [(PLANTS, done)]
+        assert ids(changes.removed) == ["planter"]
+        assert len(self.index) == 4
+        assert not self.index.update([done, TAXES, DISHES, new])
+
+    def test_search_by_text_matches_word_prefixes(self):
+        """Test that every word of the text must start a word of the title."""
+        assert ids(self.index.search(text="plan")) == ["plants", "planter"]
+        assert ids(self.index.search(text="water PLAN")) == ["plants"]
+        assert self.index.search(text="plants taxes") == []
+
+    def test_search_by_project_id_or_name(self):
+        """Test that a project matches by id, with or without dashes, and by name."""
+        assert ids(self.index.search(project=GARDEN)) == ["plants", "planter"]
+        assert ids(self.index.search(project=GARDEN.replace("-", ""))) == ["plants", "planter"]
+        assert ids(self.index.search(project="garden")) == ["plants"]
+        assert self.index.search(project="Office") == []
+
+    def test_search_by_status_and_flags(self):
+        """Test that status and flags narrow down the matches."""
+        assert ids(self.index.search(status="done")) == ["dishes"]
+        assert ids(self.index.search(flags=[FLAG_FROG])) == ["taxes"]
+        assert self.index.search(project="Garden", flags=[FLAG_FROG]) == []
+
+    def test_search_orders_by_due_date_and_limits(self):
+        """Test that matches are ordered by due date, undated last."""
+        assert ids(self.index.search()) == ["dishes", "plants", "taxes", "planter"]
+        assert ids(self.index.search(limit=2)) == ["dishes", "plants"]
+
+    def test_due_range(self):
+        """Test that due ranges include both ends and ignore the time of day."""
+        assert self.index.due_between(date(2024, 1, 2), date(2024, 1, 10)) == ["plants", "taxes"]
+        assert self.index.due_between(None, date(2024, 1, 1)) == ["dishes"]
+        assert ids(self.index.search(text="the", due_after=date(2024, 1, 2))) == ["plants", "taxes"]
+
+    def test_removed_tasks_leave_the_indexes(self):
+        """Test that a removed task is not found anymore."""
+        self.index.update([TAXES, DISHES, PLANTER])
+
+        assert ids(self.index.search(text="plan")) == ["planter"]
+        assert self.index.search(flags=[FLAG_QUICK]) == []
+        assert self.index.due_between(date(2024, 1, 2), date(2024, 1, 2)) == []
+
+
+class TestTaskCounts(unittest.TestCase):
+    """Test cases for the open task counts."""
+
+    def test_counts_follow_the_changes(self):
+        """Test that the counts only include open tasks and follow updates."""
+        counts = TaskCounts()
+        counts.apply(TaskChanges(added=[PLANTS, TAXES, DISHES, PLANTER]))
+
+        assert counts.due_between(None, date(2024, 1, 2)) == 1
+        assert counts.due_between(date(2024, 1, 3), None) == 1
+        assert counts.flagged(FLAG_QUICK) == 1
+
+        counts.apply(TaskChanges(updated=[(PLANTS, replace(PLANTS, status=STATUS_DONE))], removed=[TAXES]))
+
+        assert counts.due_between(None, None) == 0
+        assert counts.flagged(FLAG_QUICK) == 0
+        assert counts.flagged(FLAG_FROG) == 0
+
+
+class TestDecodeTask(unittest.TestCase):
+    """Test cases for decoding pages."""
+
+    def test_decode_page(self):
+        """Test that a page decodes and missing properties decode to empty values."""
+        page = {
+            'id': "page-1",
+            'last_edited_time': "2024-01-01T10:00:00.000Z",
+            'properties': {
+                "Task name": {'id': "title", 'type': "title", 'title': [{'plain_text': "Water the plants"}]},
+                "Status": {'id': TASK_STATUS_PROPERTY, 'type': "status", 'status': {'name': STATUS_NOT_STARTED}},
+                "Due": {'id': TASK_DATE_PROPERTY, 'type': "date", 'date': {'start': "2024-01-02"}},
+                "Frog": {'id': TASK_FROG_PROPERTY, 'type': "checkbox", 'checkbox': True},
+            },
+        }
+
+        task = decode_task(page)
+
+        assert task.id == "page-1"
+        assert task.title.strip() == "Water the plants"
+        assert task.status == STATUS_NOT_STARTED
+        assert task.due == "2024-01-02"
+        assert task.flags == frozenset({FLAG_FROG})
+        assert task.project == ()
+        assert task.notes is None
+        assert task.last_edited_time == "2024-01-01T10:00:00.000Z"
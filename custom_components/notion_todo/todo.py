@@ -2,7 +2,7 @@
 
 import asyncio
 import re
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import cast
 
 from homeassistant.components.todo import (
@@ -18,16 +18,14 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     DOMAIN,
-    TASK_STATUS_PROPERTY,
-    TASK_DATE_PROPERTY,
-    TASK_FROG_PROPERTY,
-    TASK_WEEKEND_PROPERTY,
-    TASK_10MIN_PROPERTY,
-    TASK_COMPLETED_PROPERTY,
-    TASK_PROJECT_PROPERTY,
+    STATUS_IN_PROGRESS,
+    STATUS_ARCHIVED,
+    STATUS_DONE,
+    STATUS_NOT_STARTED,
 )
 from .coordinator import NotionDataUpdateCoordinator
-from .notion_property_helper import NotionPropertyHelper as propHelper
+from .scheduler import PRIORITY_INTERACTIVE
+from .task_index import FLAG_COMPLETED, FLAG_FROG, FLAG_QUICK, FLAG_WEEKEND
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
@@ -37,18 +35,14 @@ async def async_setup_entry(
     
     entities = [
         NotionTodoListEntity(coordinator, 'Notion', None),
-        NotionTodoListEntity(coordinator, 'Notion Frog Tasks', TASK_FROG_PROPERTY),
-        NotionTodoListEntity(coordinator, 'Notion Weekend Tasks', TASK_WEEKEND_PROPERTY),
-        NotionTodoListEntity(coordinator, 'Notion Quick 10min Tasks', TASK_10MIN_PROPERTY),
-        NotionTodoListEntity(coordinator, 'Notion Completed Tasks', TASK_COMPLETED_PROPERTY),
+        NotionTodoListEntity(coordinator, 'Notion Frog Tasks', FLAG_FROG),
+        NotionTodoListEntity(coordinator, 'Notion Weekend Tasks', FLAG_WEEKEND),
+        NotionTodoListEntity(coordinator, 'Notion Quick 10min Tasks', FLAG_QUICK),
+        NotionTodoListEntity(coordinator, 'Notion Completed Tasks', FLAG_COMPLETED),
     ]
     
     async_add_entities(entities)
 
-STATUS_IN_PROGRESS = 'In_progress'
-STATUS_ARCHIVED = 'Paused'
-STATUS_DONE = 'Done'
-STATUS_NOT_STARTED = 'Not_started'
 NOTION_TO_HASS_STATUS = {
     STATUS_NOT_STARTED: TodoItemStatus.NEEDS_ACTION,
     STATUS_IN_PROGRESS: TodoItemStatus.NEEDS_ACTION,
@@ -76,14 +70,17 @@ class NotionTodoListEntity(CoordinatorEntity[NotionDataUpdateCoordinator], TodoL
         self,
         coordinator: NotionDataUpdateCoordinator,
         name: str,
-        filter_property: str | None = None,
+        filter_flag: str | None = None,
     ) -> None:
         """Initialize TodoListEntity."""
         super().__init__(coordinator=coordinator)
-        self._filter_property = filter_property
+        self._filter_flag = filter_flag
         self._attr_unique_id = f"{name.lower().replace(' ', '_')}_{coordinator.config_entry.entry_id}"
         self._attr_name = name
         self._status = {}
+        # Rebuilt on coordinator updates and day changes, not on every state write
+        self._attributes: dict | None = None
+        self._attributes_day: date | None = None
 
     def _group_tasks_by_date(self, items):
         """Group tasks by their due date into categories."""
@@ -122,7 +119,8 @@ class NotionTodoListEntity(CoordinatorEntity[NotionDataUpdateCoordinator], TodoL
             
             if item.description:
                 # Description format: "Project: X | Frog: True | Weekend task | Quick <10min | Completed ✓"
-                parts = item.description.split(' | ')
+                # optionally followed by a blank line and the notes of the task
+                parts = item.description.split('\n', 1)[0].split(' | ')
                 for part in parts:
                     part = part.strip()
                     if part.startswith('Project: '):
@@ -169,6 +167,10 @@ class NotionTodoListEntity(CoordinatorEntity[NotionDataUpdateCoordinator], TodoL
     @property
     def extra_state_attributes(self):
         """Return the state attributes - EXPOSING TODO_ITEMS and FORECAST."""
+        today = datetime.now().date()
+        if self._attributes is not None and self._attributes_day == today:
+            return self._attributes
+
         attrs = super().extra_state_attributes or {}
         
         # Expose todo_items as an attribute so templates can access them
@@ -178,6 +180,8 @@ class NotionTodoListEntity(CoordinatorEntity[NotionDataUpdateCoordinator], TodoL
         if self._attr_todo_items:
             attrs['forecast'] = self._group_tasks_by_date(self._attr_todo_items)
         
+        self._attributes = attrs
+        self._attributes_day = today
         return attrs
 
     @callback
@@ -187,48 +191,46 @@ class NotionTodoListEntity(CoordinatorEntity[NotionDataUpdateCoordinator], TodoL
             self._attr_todo_items = None
         else:
             items = []
-            for task in self.coordinator.data['results']:
+            for task in self.coordinator.data:
                 # Apply filter if specified
-                if self._filter_property is not None:
-                    filter_value = propHelper.get_property_by_id(self._filter_property, task)
-                    if not filter_value:  # Skip if filter property is False or None
-                        continue
-                
-                id = task['id']
-                status_value = propHelper.get_property_by_id(TASK_STATUS_PROPERTY, task)
-                self._status[id] = status_value
-                
+                if self._filter_flag is not None and self._filter_flag not in task.flags:
+                    continue
+
+                id = task.id
+                self._status[id] = task.status
+
                 # Default to NEEDS_ACTION if status not found or unknown
-                status = NOTION_TO_HASS_STATUS.get(status_value, TodoItemStatus.NEEDS_ACTION)
-                
-                # Get all properties
-                title = propHelper.get_property_by_id('title', task)
-                due_date = propHelper.get_property_by_id(TASK_DATE_PROPERTY, task)
-                frog_value = propHelper.get_property_by_id(TASK_FROG_PROPERTY, task)
-                weekend_value = propHelper.get_property_by_id(TASK_WEEKEND_PROPERTY, task)
-                quick_value = propHelper.get_property_by_id(TASK_10MIN_PROPERTY, task)
-                completed_value = propHelper.get_property_by_id(TASK_COMPLETED_PROPERTY, task)
-                project_value = propHelper.get_property_by_id(TASK_PROJECT_PROPERTY, task)
-                
+                status = NOTION_TO_HASS_STATUS.get(task.status, TodoItemStatus.NEEDS_ACTION)
+
                 # Build description with all attributes (for compatibility)
                 description_parts = []
-                if project_value:
-                    description_parts.append(f"Project: {project_value}")
-                if frog_value:
-                    description_parts.append(f"Frog: {frog_value}")
-                if weekend_value:
+                if task.project_names:
+                    description_parts.append(f"Project: {', '.join(task.project_names)}")
+                if FLAG_FROG in task.flags:
+                    description_parts.append("Frog: True")
+                if FLAG_WEEKEND in task.flags:
                     description_parts.append("Weekend task")
-                if quick_value:
+                if FLAG_QUICK in task.flags:
                     description_parts.append("Quick <10min")
-                if completed_value:
+                if FLAG_COMPLETED in task.flags:
                     description_parts.append("Completed ✓")
-                
+
                 description = " | ".join(description_parts) if description_parts else None
 
-                display_title = title
-                if due_date and 'T' in str(due_date):
-                    time_str = datetime.fromisoformat(due_date).strftime('%H:%M')
-                    display_title = f"{title.rstrip()} @ {time_str}"
+                # Append the AI summary and the page body if it was already fetched
+                notes = [
+                    text for text in (
+                        task.notes,
+                        self.coordinator.contents.get(id, task.last_edited_time),
+                    ) if text
+                ]
+                if notes:
+                    description = "\n\n".join([description or "", *notes]).strip()
+
+                display_title = task.title
+                if task.due and 'T' in task.due:
+                    time_str = datetime.fromisoformat(task.due).strftime('%H:%M')
+                    display_title = f"{task.title.rstrip()} @ {time_str}"
 
                 items.append(
                     TodoItem(
@@ -236,16 +238,20 @@ class NotionTodoListEntity(CoordinatorEntity[NotionDataUpdateCoordinator], TodoL
                         uid=id,
                         status=status,
                         description=description,
-                        due=due_date
+                        due=task.due
                     )
                 )
             self._attr_todo_items = items
+        self._attributes = None
         super()._handle_coordinator_update()
 
     async def async_create_todo_item(self, item: TodoItem) -> None:
         """Create a To-do item."""
-        await self.coordinator.client.create_task(item.summary, status=HASS_TO_NOTION_STATUS[item.status])
-        await self.coordinator.async_refresh()
+        _, sent = await self.coordinator.outbox.async_create_task(title=item.summary,
+                                                                  status=HASS_TO_NOTION_STATUS[item.status],
+                                                                  priority=PRIORITY_INTERACTIVE)
+        if sent:
+            await self.coordinator.async_full_refresh()
 
     async def async_update_todo_item(self, item: TodoItem) -> None:
         """Update a To-do item."""
@@ -257,20 +263,22 @@ class NotionTodoListEntity(CoordinatorEntity[NotionDataUpdateCoordinator], TodoL
             status = STATUS_ARCHIVED
 
         clean_title = re.sub(r' @ \d{2}:\d{2}$', '', item.summary)
-        await self.coordinator.client.update_task(task_id=uid,
-                                                  title=clean_title,
-                                                  status=status,
-                                                  due=item.due,
-                                                  description=item.description)
-
-        await self.coordinator.async_refresh()
+        # Queued writes are persisted, so the due date is passed as ISO string
+        due = item.due.isoformat() if isinstance(item.due, date) else item.due
+        if await self.coordinator.outbox.async_update_task(uid,
+                                                           title=clean_title,
+                                                           status=status,
+                                                           due=due,
+                                                           description=item.description):
+            await self.coordinator.async_full_refresh()
 
     async def async_delete_todo_items(self, uids: list[str]) -> None:
         """Delete a To-do item."""
-        await asyncio.gather(
-            *[self.coordinator.client.delete_task(task_id=uid) for uid in uids]
+        sent = await asyncio.gather(
+            *[self.coordinator.outbox.async_delete_task(uid) for uid in uids]
         )
-        await self.coordinator.async_refresh()
+        if any(sent):
+            await self.coordinator.async_full_refresh()
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass update state from existing coordinator data."""
@@ -0,0 +1,150 @@
+"""Benchmark of the JSON codecs on Notion-sized payloads.
+
+Compares the standard library with orjson for the three places the
+integration handles JSON: request bodies, query responses and the todo
+entity attributes. Does not need Home Assistant.
+
+Usage (from the repository root):
+
+    python scripts/codec_benchmark.py --tasks 100 1000 5000
+"""
+from __future__ import annotations
+
+import argparse
+from datetime import date, timedelta
+import json
+import random
+import statistics
+import time
+import uuid
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CODECS = {
+    "json": (
+        lambda obj: json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode(),
+        json.loads,
+    ),
+}
+if orjson is not None:
+    CODECS["orjson"] = (orjson.dumps, orjson.loads)
+
+
+def _text(content: str) -> list[dict]:
+    return [{
+        "type": "text",
+        "text": {"content": content, "link": None},
+        "annotations": {
+            "bold": False, "italic": False, "strikethrough": False,
+            "underline": False, "code": False, "color": "default",
+        },
+        "plain_text": content,
+        "href": None,
+    }]
+
+
+def notion_page(index: int) -> dict:
+    """Return a task page shaped like a Notion query result."""
+    due = date.today() + timedelta(days=random.randint(0, 30))
+    return {
+        "object": "page",
+        "id": str(uuid.uuid4()),
+        "created_time": "2024-03-01T10:00:00.000Z",
+        "last_edited_time": "2024-03-02T10:00:00.000Z",
+        "created_by": {"object": "user", "id": str(uuid.uuid4())},
+        "last_edited_by": {"object": "user", "id": str(uuid.uuid4())},
+        "cover": None,
+        "icon": None,
+        "parent": {"type": "database_id", "database_id": str(uuid.uuid4())},
+        "archived": False,
+        "properties": {
+            "Task name": {"id": "title", "type": "title", "title": _text(f"Task number {index} ünïcödé")},
+            "Status": {"id": "status", "type": "status", "status": {
+                "id": "1", "name": random.choice(["Not_started", "In_progress", "Done"]), "color": "blue"}},
+            "Due": {"id": "due", "type": "date", "date": {"start": due.isoformat(), "end": None, "time_zone": None}},
+            "Frog": {"id": "frog", "type": "checkbox", "checkbox": random.random() < 0.2},
+            "Weekend": {"id": "weekend", "type": "checkbox", "checkbox": random.random() < 0.2},
+            "<10min": {"id": "quick", "type": "checkbox", "checkbox": random.random() < 0.3},
+            "Completed": {"id": "completed", "type": "checkbox", "checkbox": False},
+            "Project": {"id": "project", "type": "relation", "relation": [{"id": str(uuid.uuid4())}], "has_more": False},
+            "Summary": {"id": "summary", "type": "rich_text", "rich_text": _text("Some notes about the task " * 4)},
+            "OmniFocus project sync": {"id": "of", "type": "select", "select": {
+                "id": "h", "name": "Household", "color": "green"}},
+            "Tags": {"id": "tags", "type": "multi_select", "multi_select": [{"id": "t", "name": "HA-Auto", "color": "red"}]},
+        },
+        "url": "https://www.notion.so/Task-0000",
+    }
+
+
+def todo_attributes(pages: list[dict]) -> dict:
+    """Return attributes shaped like the todo entity's todo_items and forecast."""
+    items = [
+        {
+            "summary": page["properties"]["Task name"]["title"][0]["plain_text"],
+            "uid": page["id"],
+            "status": "needs_action",
+            "due": page["properties"]["Due"]["date"]["start"],
+            "description": "Project: Household | Quick <10min\n\nSome notes about the task",
+        }
+        for page in pages
+    ]
+    forecast = {
+        "future": {
+            "count": len(items),
+            "tasks": [
+                {"summary": item["summary"], "project": "Household", "uid": item["uid"], "completed": False,
+                 "status": "Not_started", "is_frog": False, "is_weekend": False, "is_quick": True}
+                for item in items
+            ],
+        }
+    }
+    return {"todo_items": items, "forecast": forecast}
+
+
+def measure(func, arg, repeat: int) -> float:
+    """Return the median duration of func(arg) in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    random.seed(0)
+
+    if orjson is None:
+        print("orjson is not installed, only the standard library is measured")  # noqa: T201
+
+    request = {"properties": notion_page(0)["properties"]}
+    rows = []
+    for tasks in args.tasks:
+        pages = [notion_page(index) for index in range(tasks)]
+        response = CODECS["json"][0]({"object": "list", "results": pages, "has_more": False, "next_cursor": None})
+        attributes = todo_attributes(pages)
+        for name, (dumps, loads) in CODECS.items():
+            rows.append((
+                tasks,
+                len(response) / 1024,
+                name,
+                measure(dumps, request, args.repeat * 50),
+                measure(loads, response, args.repeat),
+                measure(dumps, attributes, args.repeat),
+            ))
+
+    print(f"{'tasks':>6} {'KiB':>8} {'codec':>7} {'request ms':>11} {'decode ms':>10} {'attrs ms':>9}")  # noqa: T201
+    for tasks, size, name, encode, decode, attrs in rows:
+        print(f"{tasks:>6} {size:>8.0f} {name:>7} {encode:>11.4f} {decode:>10.2f} {attrs:>9.2f}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
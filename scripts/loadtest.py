@@ -0,0 +1,474 @@
+"""End-to-end load generator for the notion_todo write paths.
+
+Starts a throw-away Home Assistant instance with the integration pointed at
+a local Notion stand-in, then drives the notion_todo services and the todo
+entity write methods concurrently and reports throughput, latency
+percentiles, failed coordinator refreshes, the number of Notion API calls
+and the event loop lag.
+
+Usage (from the repository root, with the requirements installed):
+
+    python scripts/loadtest.py --scenario create_task --calls 50 --spread 3
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+import os
+import random
+import tempfile
+import time
+import uuid
+
+from aiohttp import web
+
+from homeassistant import bootstrap, runner
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_ACCESS_TOKEN
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOMAIN = "notion_todo"
+DATABASE_ID = "00000000-0000-0000-0000-00000000load"
+TODO_ENTITY = "todo.notion"
+SCENARIOS = ("create_task", "todo_add", "todo_update")
+LAG_INTERVAL = 0.05
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _notion_date(start: str | None) -> str | None:
+    """Return a date start the way Notion returns it, times with milliseconds and offset."""
+    if not start or len(start) <= 10:
+        return start
+    value = datetime.fromisoformat(start)
+    if value.tzinfo is None:
+        # The load test instance runs in UTC
+        value = value.replace(tzinfo=timezone.utc)
+    return value.isoformat(timespec="milliseconds")
+
+
+def _text(content: str) -> list[dict]:
+    return [{"type": "text", "text": {"content": content}, "plain_text": content}]
+
+
+class NotionStandIn:
+    """Minimal in-memory implementation of the Notion endpoints used by the integration."""
+
+    def __init__(self, latency: float) -> None:
+        """Initialize the stand-in."""
+        # Imported late, HA puts the config dir on sys.path during setup
+        from custom_components.notion_todo import const
+
+        self.latency = latency
+        self.calls: Counter[str] = Counter()
+        self.pages: dict[str, dict] = {}
+        self.projects: dict[str, dict] = {}
+        self.schema = {
+            "Task name": {"id": "title", "type": "title"},
+            "Status": {"id": const.TASK_STATUS_PROPERTY, "type": "status"},
+            "Due": {"id": const.TASK_DATE_PROPERTY, "type": "date"},
+            "Frog": {"id": const.TASK_FROG_PROPERTY, "type": "checkbox"},
+            "Weekend": {"id": const.TASK_WEEKEND_PROPERTY, "type": "checkbox"},
+            "<10min": {"id": const.TASK_10MIN_PROPERTY, "type": "checkbox"},
+            "Completed": {"id": const.TASK_COMPLETED_PROPERTY, "type": "checkbox"},
+            "Project": {"id": const.TASK_PROJECT_PROPERTY, "type": "relation"},
+            "Summary": {"id": const.TASK_DESCRIPTION_PROPERTY, "type": "rich_text"},
+            "OmniFocus project sync": {"id": const.TASK_OMNIFOCUS_PROJECT_SYNC_PROPERTY, "type": "select"},
+            "unmovable by AI": {"id": "unmv", "type": "checkbox"},
+            "Tags": {"id": "tags", "type": "multi_select"},
+        }
+
+    def app(self) -> web.Application:
+        """Return the aiohttp application serving the stand-in."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_post("/v1/databases/{database_id}/query", self._query)
+        app.router.add_get("/v1/databases/{database_id}", self._database)
+        app.router.add_post("/v1/pages", self._create_page)
+        app.router.add_get("/v1/pages/{page_id}", self._get_page)
+        app.router.add_patch("/v1/pages/{page_id}", self._update_page)
+        app.router.add_delete("/v1/blocks/{page_id}", self._archive_page)
+        app.router.add_get("/v1/blocks/{page_id}/children", self._children)
+        return app
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        self.calls[f"{request.method} {request.match_info.route.resource.canonical}"] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return await handler(request)
+
+    def _empty_value(self, prop_type: str):
+        return {
+            "title": [], "rich_text": [], "relation": [], "multi_select": [],
+            "checkbox": False, "status": None, "date": None, "select": None,
+        }[prop_type]
+
+    def _new_page(self, properties: dict) -> dict:
+        now = _now()
+        page = {
+            "object": "page",
+            "id": str(uuid.uuid4()),
+            "created_time": now,
+            "last_edited_time": now,
+            "archived": False,
+            "properties": {
+                name: {**prop, prop["type"]: self._empty_value(prop["type"])}
+                for name, prop in self.schema.items()
+            },
+        }
+        self._apply(page, properties)
+        return page
+
+    def _apply(self, page: dict, properties: dict) -> None:
+        for name, value in properties.items():
+            if name not in page["properties"]:
+                continue
+            prop = page["properties"][name]
+            prop_type = prop["type"]
+            new_value = value.get(prop_type)
+            if prop_type in ("title", "rich_text"):
+                new_value = [
+                    {**part, "plain_text": part.get("text", {}).get("content", "")}
+                    for part in new_value or []
+                ]
+            elif prop_type == "status" and new_value:
+                # update_task sends the status name as id
+                new_value = {"name": new_value.get("name") or new_value.get("id")}
+            elif prop_type == "date" and new_value:
+                new_value = {**new_value, "start": _notion_date(new_value.get("start"))}
+            prop[prop_type] = new_value
+        page["last_edited_time"] = _now()
+
+    def seed(self, tasks: int, projects: int) -> None:
+        """Create projects and tasks due within the next 30 days."""
+        for number in range(projects):
+            project_id = str(uuid.uuid4())
+            self.projects[project_id] = {
+                "object": "page",
+                "id": project_id,
+                "last_edited_time": _now(),
+                "properties": {"Name": {"id": "title", "type": "title", "title": _text(f"Project {number}")}},
+            }
+        project_ids = list(self.projects)
+        today = date.today()
+        for number in range(tasks):
+            due = today + timedelta(days=random.randint(0, 30))
+            if random.random() < 0.2:
+                start = f"{due.isoformat()}T{random.randint(7, 20):02d}:00:00.000+00:00"
+            else:
+                start = due.isoformat()
+            page = self._new_page({
+                "Task name": {"title": _text(f"Seeded task {number} invoice review")},
+                "Status": {"status": {"name": random.choice(["Not_started", "In_progress", "Done"])}},
+                "Due": {"date": {"start": start}},
+                "Frog": {"checkbox": random.random() < 0.1},
+                "Weekend": {"checkbox": random.random() < 0.2},
+                "<10min": {"checkbox": random.random() < 0.3},
+                "Project": {"relation": [{"id": random.choice(project_ids)}] if project_ids else []},
+            })
+            self.pages[page["id"]] = page
+
+    def _matches(self, page: dict, condition: dict) -> bool:
+        """Evaluate the subset of the Notion filter syntax the integration uses."""
+        if "and" in condition:
+            return all(self._matches(page, part) for part in condition["and"])
+        if "or" in condition:
+            return any(self._matches(page, part) for part in condition["or"])
+        prop = next(
+            (prop for name, prop in page["properties"].items()
+             if condition["property"] in (name, prop["id"])),
+            None,
+        )
+        if prop is None:
+            return False
+        if "date" in condition:
+            day = (prop["date"] or {}).get("start", "")[:10]
+            if not day:
+                return False
+            (operator, value), = condition["date"].items()
+            return {
+                "on_or_after": day >= value, "after": day > value,
+                "on_or_before": day <= value, "before": day < value, "equals": day == value,
+            }[operator]
+        if "status" in condition:
+            name = (prop["status"] or {}).get("name")
+            (operator, value), = condition["status"].items()
+            return {"equals": name == value, "does_not_equal": name != value}[operator]
+        raise web.HTTPBadRequest(text=f"Unsupported filter: {condition}")
+
+    async def _query(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        condition = body.get("filter")
+        results = [
+            page for page in self.pages.values()
+            if not page["archived"] and (condition is None or self._matches(page, condition))
+        ]
+        if keep := request.query.getall("filter_properties", []):
+            results = [
+                {**page, "properties": {
+                    name: prop for name, prop in page["properties"].items() if prop["id"] in keep
+                }}
+                for page in results
+            ]
+        for sort in reversed(body.get("sorts", [])):
+            results.sort(
+                key=lambda page, sort=sort: page.get(sort.get("timestamp"), ""),
+                reverse=sort.get("direction") == "descending",
+            )
+        page_size = min(body.get("page_size", 100), 100)
+        start = int(body.get("start_cursor") or 0)
+        chunk = results[start:start + page_size]
+        has_more = start + page_size < len(results)
+        return web.json_response({
+            "object": "list",
+            "results": chunk,
+            "has_more": has_more,
+            "next_cursor": str(start + page_size) if has_more else None,
+        })
+
+    async def _database(self, request: web.Request) -> web.Response:
+        return web.json_response({
+            "object": "database",
+            "id": DATABASE_ID,
+            "properties": {
+                name: {**prop, prop["type"]: {}} for name, prop in self.schema.items()
+            },
+        })
+
+    async def _create_page(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        page = self._new_page(body.get("properties", {}))
+        self.pages[page["id"]] = page
+        return web.json_response(page)
+
+    async def _get_page(self, request: web.Request) -> web.Response:
+        page_id = request.match_info["page_id"]
+        page = self.pages.get(page_id) or self.projects.get(page_id)
+        if page is None:
+            raise web.HTTPNotFound()
+        return web.json_response(page)
+
+    async def _update_page(self, request: web.Request) -> web.Response:
+        page = self.pages.get(request.match_info["page_id"])
+        if page is None:
+            raise web.HTTPNotFound()
+        body = await request.json()
+        self._apply(page, body.get("properties", {}))
+        return web.json_response(page)
+
+    async def _archive_page(self, request: web.Request) -> web.Response:
+        page = self.pages.get(request.match_info["page_id"])
+        if page is None:
+            raise web.HTTPNotFound()
+        page["archived"] = True
+        page["last_edited_time"] = _now()
+        return web.json_response(page)
+
+    async def _children(self, request: web.Request) -> web.Response:
+        return web.json_response({"object": "list", "results": [], "has_more": False, "next_cursor": None})
+
+
+class LoopLagMonitor:
+    """Measure how late the event loop wakes up a periodic sleeper."""
+
+    def __init__(self) -> None:
+        """Initialize the monitor."""
+        self.samples: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + LAG_INTERVAL
+            await asyncio.sleep(LAG_INTERVAL)
+            self.samples.append(max(0.0, loop.time() - expected))
+
+    def start(self) -> None:
+        """Start sampling."""
+        self.samples = []
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        if self._task:
+            self._task.cancel()
+
+
+class UpdateFailureCounter:
+    """Record failed coordinator refreshes, HA only logs them and never raises to the callers."""
+
+    def __init__(self, coordinator) -> None:
+        """Wrap the update method of the coordinator."""
+        self.failures: list[str] = []
+        update = coordinator._async_update_data
+
+        async def counted():
+            try:
+                return await update()
+            except Exception as err:  # pylint: disable=broad-except
+                self.failures.append(repr(err))
+                raise
+
+        coordinator._async_update_data = counted
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Return the nearest-rank percentile of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+async def _timed(coro, offset: float, latencies: list[float], errors: list[str]) -> None:
+    await asyncio.sleep(offset)
+    started = time.perf_counter()
+    try:
+        await coro
+    except Exception as err:  # pylint: disable=broad-except
+        errors.append(repr(err))
+        return
+    latencies.append(time.perf_counter() - started)
+
+
+async def run_scenario(
+    hass, standin: NotionStandIn, updates: UpdateFailureCounter, scenario: str, calls: int, spread: float
+) -> dict:
+    """Issue the calls of one scenario and collect the measurements."""
+    if scenario == "create_task":
+        def make_call(number):
+            return hass.services.async_call(DOMAIN, "create_task", {
+                "task_name": f"Load test task {number}",
+                "due_date": (date.today() + timedelta(days=number % 14)).isoformat(),
+            }, blocking=True)
+    elif scenario == "todo_add":
+        def make_call(number):
+            return hass.services.async_call("todo", "add_item", {
+                "item": f"Load test item {number}",
+            }, target={"entity_id": TODO_ENTITY}, blocking=True)
+    else:
+        open_ids = [
+            page["id"] for page in standin.pages.values()
+            if not page["archived"] and (page["properties"]["Due"]["date"] or {}).get("start", "")[:10] >= date.today().isoformat()
+        ]
+
+        def make_call(number):
+            return hass.services.async_call("todo", "update_item", {
+                "item": open_ids[number % len(open_ids)],
+                "status": "completed" if number % 2 == 0 else "needs_action",
+            }, target={"entity_id": TODO_ENTITY}, blocking=True)
+
+    latencies: list[float] = []
+    errors: list[str] = []
+    monitor = LoopLagMonitor()
+    standin.calls.clear()
+    failures_before = len(updates.failures)
+    monitor.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _timed(make_call(number), random.uniform(0, spread), latencies, errors)
+        for number in range(calls)
+    ))
+    elapsed = time.perf_counter() - started
+    monitor.stop()
+    # Let the refreshes started in the background by the calls finish
+    await hass.async_block_till_done()
+    update_failures = updates.failures[failures_before:]
+    return {
+        "scenario": scenario,
+        "calls": calls,
+        "errors": len(errors),
+        "elapsed": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "api_calls": sum(standin.calls.values()),
+        "api_calls_by_route": dict(standin.calls),
+        "lag_p95": percentile(monitor.samples, 95),
+        "lag_max": max(monitor.samples, default=0.0),
+        "first_error": errors[0] if errors else None,
+        "update_failures": len(update_failures),
+        "first_update_failure": update_failures[0] if update_failures else None,
+    }
+
+
+def format_report(results: list[dict]) -> str:
+    """Render the measurements as a plain text report."""
+    lines = []
+    for result in results:
+        lines += [
+            f"== {result['scenario']}: {result['calls']} calls, {result['errors']} errors, "
+            f"{result['update_failures']} failed refreshes in {result['elapsed']:.2f}s",
+            f"   throughput      {result['throughput']:.1f} calls/s",
+            f"   latency p50/p95/p99  {result['p50'] * 1000:.0f} / {result['p95'] * 1000:.0f} / {result['p99'] * 1000:.0f} ms",
+            f"   Notion API calls     {result['api_calls']} ({result['api_calls'] / max(result['calls'], 1):.1f} per call)",
+            f"   event loop lag p95/max  {result['lag_p95'] * 1000:.1f} / {result['lag_max'] * 1000:.1f} ms",
+        ]
+        lines += [f"     {count:6d}  {route}" for route, count in sorted(result["api_calls_by_route"].items())]
+        if result["first_error"]:
+            lines.append(f"   first error: {result['first_error']}")
+        if result["first_update_failure"]:
+            lines.append(f"   first failed refresh: {result['first_update_failure']}")
+    return "\n".join(lines)
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Set up Home Assistant with the stand-in and run the scenarios."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        os.symlink(os.path.join(REPO_ROOT, "custom_components"), os.path.join(config_dir, "custom_components"))
+        with open(os.path.join(config_dir, "configuration.yaml"), "w", encoding="utf-8") as config:
+            config.write("homeassistant:\n  time_zone: UTC\nlogger:\n  default: warning\n")
+
+        hass = await bootstrap.async_setup_hass(runner.RuntimeConfig(config_dir=config_dir, skip_pip=True))
+        await hass.async_start()
+
+        from custom_components.notion_todo.api import NotionApiClient
+        from custom_components.notion_todo.const import CONF_DATABASE_ID
+
+        standin = NotionStandIn(args.latency / 1000)
+        standin.seed(args.tasks, args.projects)
+        app_runner = web.AppRunner(standin.app())
+        await app_runner.setup()
+        site = web.TCPSite(app_runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        NotionApiClient.base_url = f"http://127.0.0.1:{port}/v1"
+
+        try:
+            entry = ConfigEntry(
+                version=1,
+                minor_version=1,
+                domain=DOMAIN,
+                title=DATABASE_ID,
+                data={CONF_ACCESS_TOKEN: "loadtest", CONF_DATABASE_ID: DATABASE_ID},
+                source="user",
+            )
+            await hass.config_entries.async_add(entry)
+            await hass.async_block_till_done()
+            updates = UpdateFailureCounter(hass.data[DOMAIN][entry.entry_id])
+
+            results = []
+            for scenario in args.scenario or SCENARIOS:
+                results.append(await run_scenario(hass, standin, updates, scenario, args.calls, args.spread))
+            print(format_report(results))  # noqa: T201
+        finally:
+            await hass.async_stop()
+            await app_runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS,
+                        help="scenario to run, may be repeated (default: all)")
+    parser.add_argument("--calls", type=int, default=50, help="calls per scenario")
+    parser.add_argument("--spread", type=float, default=3.0, help="seconds over which the calls start")
+    parser.add_argument("--tasks", type=int, default=500, help="tasks seeded into the stand-in")
+    parser.add_argument("--projects", type=int, default=10, help="projects seeded into the stand-in")
+    parser.add_argument("--latency", type=float, default=80.0, help="stand-in latency per request in ms")
+    asyncio.run(main(parser.parse_args()))